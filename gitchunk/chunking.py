@@ -1,25 +1,192 @@
+import errno
 import logging
+import os
+import re
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from operator import itemgetter
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 from send2trash import send2trash
 
 logger = logging.getLogger(__name__)
 
+# En Windows os.open abre en modo texto si no se indica lo contrario.
+O_BINARY = getattr(os, "O_BINARY", 0)
+
 
 class FileChunker:
     SUFFIX = ".gc"
+    # 'video.mp4.gc.001' -> ('video.mp4', '001'). split_file rellena a 3 dígitos,
+    # así que a partir del trozo 1000 el número crece: se aceptan 3 o más.
+    PART_RE = re.compile(rf"^(.+){re.escape(SUFFIX)}\.(\d{{3,}})$")
     BLOCK_SIZE = 1024 * 1024 * 5
+    MAX_WORKERS = 8
+
+    @staticmethod
+    def _fadvise(fd: int, offset: int, length: int, *advices: str):
+        """
+        Indica al kernel el patrón de acceso (posix_fadvise) si la plataforma lo soporta.
+        Es solo una pista: cualquier fallo se ignora.
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        for advice in advices:
+            try:
+                os.posix_fadvise(fd, offset, length, getattr(os, advice))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _preallocate(fd: int, length: int):
+        """
+        Reserva de una vez el espacio del archivo destino (posix_fallocate) para
+        evitar extents fragmentados y detectar falta de espacio antes de copiar.
+        """
+        if length <= 0 or not hasattr(os, "posix_fallocate"):
+            return
+        try:
+            os.posix_fallocate(fd, 0, length)
+        except OSError as e:
+            # Algunos sistemas de archivos no lo soportan; solo ENOSPC es un error real.
+            if e.errno == errno.ENOSPC:
+                raise
+
+    @staticmethod
+    def _fsync_dir(folder: Path):
+        """Persiste las entradas de un directorio (solo POSIX; no-op en Windows)."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    @classmethod
+    def _copy_range(cls, src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+        """
+        Copia `count` bytes de src_fd (desde `offset`) en la posición actual de dst_fd.
+        Usa copy_file_range o sendfile para que la copia ocurra dentro del kernel;
+        si ninguno está disponible (Windows, macOS) recurre a read/write por bloques.
+        Devuelve el número de bytes copiados.
+        """
+        copied = 0
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied < count:
+                    sent = os.copy_file_range(
+                        src_fd, dst_fd, count - copied, offset + copied
+                    )
+                    if sent == 0:
+                        return copied
+                    copied += sent
+                return copied
+            except OSError as e:
+                # ENOSYS/EXDEV/EINVAL: kernel antiguo o distinto sistema de archivos.
+                if e.errno not in (errno.ENOSYS, errno.EXDEV, errno.EINVAL):
+                    raise
+
+        if hasattr(os, "sendfile"):
+            try:
+                while copied < count:
+                    sent = os.sendfile(dst_fd, src_fd, offset + copied, count - copied)
+                    if sent == 0:
+                        return copied
+                    copied += sent
+                return copied
+            except OSError as e:
+                # En macOS sendfile solo acepta sockets como destino (ENOTSOCK).
+                if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK):
+                    raise
+
+        # Un único buffer reutilizable: readinto evita crear un bytes por bloque.
+        buffer = memoryview(bytearray(min(cls.BLOCK_SIZE, max(count - copied, 1))))
+        with open(src_fd, "rb", buffering=0, closefd=False) as src:
+            src.seek(offset + copied)
+            while copied < count:
+                read = src.readinto(buffer[: count - copied])
+                if not read:
+                    break
+                pending = buffer[:read]
+                while pending:
+                    written = os.write(dst_fd, pending)
+                    pending = pending[written:]
+                copied += read
+        return copied
+
+    @classmethod
+    def _write_chunk(
+        cls,
+        file_path: Path,
+        chunk_path_final: Path,
+        offset: int,
+        length: int,
+        use_trash: bool = False,
+    ) -> Path:
+        """
+        Copia el rango [offset, offset + length) del archivo original en su trozo.
+        Cada llamada abre su propio descriptor, por lo que es segura entre hilos.
+        """
+        chunk_path_tmp = chunk_path_final.with_name(chunk_path_final.name + ".tmp")
+
+        src_fd = os.open(file_path, os.O_RDONLY | O_BINARY)
+        try:
+            cls._fadvise(src_fd, offset, length, "POSIX_FADV_SEQUENTIAL")
+            dst_fd = os.open(
+                chunk_path_tmp,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY,
+                0o644,
+            )
+            try:
+                cls._preallocate(dst_fd, length)
+                copied = cls._copy_range(src_fd, dst_fd, offset, length)
+                if copied != length:
+                    # No dejar bytes reservados sin escribir al final del trozo.
+                    os.ftruncate(dst_fd, copied)
+            finally:
+                os.close(dst_fd)
+
+            # El rango ya copiado no se vuelve a leer: liberar page cache.
+            cls._fadvise(src_fd, offset, length, "POSIX_FADV_DONTNEED")
+        except Exception:
+            if chunk_path_tmp.exists():
+                chunk_path_tmp.unlink()
+            raise
+        finally:
+            os.close(src_fd)
+
+        if use_trash and chunk_path_final.exists():
+            send2trash(chunk_path_final)
+
+        # os.replace sobrescribe de forma atómica un trozo previo (también en Windows).
+        os.replace(chunk_path_tmp, chunk_path_final)
+        logger.debug("Trozo generado: %s", chunk_path_final.name)
+        return chunk_path_final
+
+    @staticmethod
+    def part_sizes(file_size: int, chunk_size: int) -> List[int]:
+        """Tamaño de cada trozo que produce split_file para un archivo de file_size bytes."""
+        return [
+            min(chunk_size, file_size - offset)
+            for offset in range(0, file_size, chunk_size)
+        ]
 
     @classmethod
     def split_file(
         cls,
         file_path: Path,
         chunk_size: int,
+        use_trash: bool = False,
     ) -> List[Path]:
         """
         Divide un archivo en trozos de tamaño chunk_size.
+        Cada trozo es un rango independiente del original, así que se escriben en paralelo.
         Cada trozo se escribe primero como .tmp y se renombra al finalizar.
+        Si use_trash es True, los trozos previos con el mismo nombre van a la papelera.
         El archivo original se elimina solo si la operación es exitosa.
         """
         if not file_path.exists():
@@ -33,30 +200,44 @@ class FileChunker:
             f"Dividiendo {file_path.name} ({file_size / 1024**2:.2f} MB) en {total_parts} trozos."
         )
 
+        # 'video.mp4.gc.' se construye una vez; en el bucle solo cambia el número.
+        parent = file_path.parent
+        prefix = f"{file_path.name}{cls.SUFFIX}."
+
+        if total_parts == 1:
+            # Un solo trozo es el archivo completo: basta con renombrarlo.
+            chunk_path_final = parent / (prefix + "001")
+            if use_trash and chunk_path_final.exists():
+                send2trash(chunk_path_final)
+            os.replace(file_path, chunk_path_final)
+            logger.info(
+                f"Proceso completado. '{file_path.name}' renombrado a un único trozo."
+            )
+            return [chunk_path_final]
+
+        tasks = []
+        for i, length in enumerate(cls.part_sizes(file_size, chunk_size)):
+            chunk_path_final = parent / (prefix + format(i + 1, "03d"))
+            tasks.append((chunk_path_final, i * chunk_size, length))
+
+        workers = max(1, min(os.cpu_count() or 1, cls.MAX_WORKERS, total_parts))
+
         try:
-            with open(file_path, "rb") as f:
-                for i in range(total_parts):
-                    part_num = i + 1
-                    chunk_name_final = f"{file_path.name}{cls.SUFFIX}.{part_num:03d}"
-                    chunk_path_final = file_path.parent / chunk_name_final
-                    chunk_path_tmp = chunk_path_final.with_suffix(".tmp")
-
-                    remaining_to_read = chunk_size
-                    with open(chunk_path_tmp, "wb") as out_tmp:
-                        while remaining_to_read > 0:
-                            to_read = min(cls.BLOCK_SIZE, remaining_to_read)
-                            data = f.read(to_read)
-                            if not data:
-                                break
-                            out_tmp.write(data)
-                            remaining_to_read -= len(data)
-
-                    if chunk_path_final.exists():
-                        send2trash(chunk_path_final)
-
-                    chunk_path_tmp.rename(chunk_path_final)
-                    chunks_creados.append(chunk_path_final)
-                    logger.debug(f"Trozo generado: {chunk_name_final}")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(cls._write_chunk, file_path, *task, use_trash)
+                    for task in tasks
+                ]
+                wait(futures, return_when=FIRST_EXCEPTION)
+                # Si un trozo falló, no se empiezan los pendientes.
+                for future in futures:
+                    future.cancel()
+
+            started = [f for f in futures if not f.cancelled()]
+            chunks_creados = [f.result() for f in started if f.exception() is None]
+            error = next((f.exception() for f in started if f.exception()), None)
+            if error is not None:
+                raise error
 
             file_path.unlink()
             logger.info(f"Proceso completado. Original '{file_path.name}' eliminado.")
@@ -70,70 +251,143 @@ class FileChunker:
             raise e
 
     @classmethod
-    def join_files(cls, folder: Path):
+    def _iter_chunks(cls, root: str):
         """
-        Escanea la carpeta buscando archivos .gc.### y los une.
-        Utiliza un archivo .tmp para la reconstrucción antes de renombrar al original.
+        Recorre `root` con os.scandir y produce (DirEntry, match) por cada trozo .gc.###.
+        Solo se filtra por nombre: no se hace stat ni se construyen Path por entrada.
         """
-        grupos = {}
-        for chunk_file in folder.rglob(f"*{cls.SUFFIX}.[0-9][0-9][0-9]"):
-            # Obtenemos 'video.mp4' de 'video.mp4.gc.001'
-            base_name = chunk_file.name.split(cls.SUFFIX)[0]
-            target_path = chunk_file.parent / base_name
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from cls._iter_chunks(entry.path)
+                        continue
+                    match = cls.PART_RE.match(entry.name)
+                    if match:
+                        yield entry, match
+        except PermissionError as e:
+            logger.warning(f"No se pudo leer la carpeta {root}: {e}")
 
-            if target_path not in grupos:
-                grupos[target_path] = []
-            grupos[target_path].append(chunk_file)
+    @classmethod
+    def _join_one(
+        cls, target_path: Path, parts: List[Tuple[int, Path]], use_trash: bool = False
+    ) -> bool:
+        """
+        Reconstruye un archivo a partir de sus trozos (part_num, ruta).
+        Devuelve False si faltan trozos; lanza la excepción si la unión falla.
+        """
+        parts.sort(key=itemgetter(0))  # Ordenar por número de trozo (1, 2...)
+        chunks = [chunk_p for _, chunk_p in parts]
 
-        if not grupos:
-            logger.info("No se encontraron archivos fragmentados para unir.")
-            return
+        # Si el último trozo es .005, deberíamos tener 5 archivos.
+        last_chunk_num = parts[-1][0]
+        if len(chunks) != last_chunk_num:
+            logger.error(
+                f"Error: Faltan trozos para {target_path.name}. "
+                f"Se esperaban {last_chunk_num} y hay {len(chunks)}."
+            )
+            return False
 
-        for target_path, chunks in grupos.items():
-            chunks.sort()  # Ordenar por el número de extensión (.001, .002...)
+        if len(chunks) == 1:
+            # Un único trozo ya es el archivo completo: basta con renombrarlo.
+            if use_trash and target_path.exists():
+                send2trash(target_path)
+            os.replace(chunks[0], target_path)
+            logger.info(f"¡Archivo '{target_path.name}' restaurado exitosamente!")
+            return True
 
-            # Si el último trozo es .005, deberíamos tener 5 archivos.
-            last_chunk_num = int(chunks[-1].suffix.split(".")[-1])
-            if len(chunks) != last_chunk_num:
-                logger.error(
-                    f"Error: Faltan trozos para {target_path.name}. "
-                    f"Se esperaban {last_chunk_num} y hay {len(chunks)}."
-                )
-                continue
+        # Nombre propio por destino: 'video.mp4' y 'video.mkv' no comparten temporal.
+        target_path_tmp = target_path.with_name(target_path.name + ".tmp")
 
-            target_path_tmp = target_path.with_suffix(".tmp")
+        logger.info(f"Restaurando '{target_path.name}' desde {len(chunks)} trozos...")
 
-            logger.info(
-                f"Restaurando '{target_path.name}' desde {len(chunks)} trozos..."
+        try:
+            out_fd = os.open(
+                target_path_tmp,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY,
+                0o644,
             )
-
             try:
-                with open(target_path_tmp, "wb") as out_file:
-                    for chunk_p in chunks:
-                        with open(chunk_p, "rb") as part_file:
-                            while True:
-                                data = part_file.read(cls.BLOCK_SIZE)
-                                if not data:
-                                    break
-                                out_file.write(data)
+                total_size = sum(chunk_p.stat().st_size for chunk_p in chunks)
+                cls._preallocate(out_fd, total_size)
+                written = 0
+                for chunk_p in chunks:
+                    in_fd = os.open(chunk_p, os.O_RDONLY | O_BINARY)
+                    try:
+                        part_size = os.fstat(in_fd).st_size
+                        cls._fadvise(
+                            in_fd,
+                            0,
+                            part_size,
+                            "POSIX_FADV_SEQUENTIAL",
+                            "POSIX_FADV_WILLNEED",
+                        )
+                        written += cls._copy_range(in_fd, out_fd, 0, part_size)
+                        cls._fadvise(in_fd, 0, part_size, "POSIX_FADV_DONTNEED")
+                    finally:
+                        os.close(in_fd)
+                if written != total_size:
+                    os.ftruncate(out_fd, written)
+                os.fsync(out_fd)
+            finally:
+                os.close(out_fd)
 
-                # Verificación básica: ¿El temporal existe y tiene datos?
-                if target_path_tmp.stat().st_size == 0:
-                    raise Exception("El archivo resultante está vacío.")
+            # Verificación básica: ¿El temporal existe y tiene datos?
+            if target_path_tmp.stat().st_size == 0:
+                raise Exception("El archivo resultante está vacío.")
 
-                # Paso final: Renombrar temporal a original y borrar trozos
-                if target_path.exists():
-                    send2trash(target_path)  # Si ya existía uno viejo, lo quitamos
+            # Paso final: Renombrar temporal a original y borrar trozos
+            if use_trash and target_path.exists():
+                send2trash(target_path)  # Si ya existía uno viejo, lo quitamos
 
-                target_path_tmp.rename(target_path)
+            os.replace(target_path_tmp, target_path)
 
-                for chunk_p in chunks:
-                    chunk_p.unlink()
+            for chunk_p in chunks:
+                os.unlink(chunk_p)
+            # Un único fsync del directorio persiste el rename y todos los unlink.
+            cls._fsync_dir(target_path.parent)
+
+            logger.info(f"¡Archivo '{target_path.name}' restaurado exitosamente!")
+
+        except Exception as e:
+            logger.error(f"Fallo al unir {target_path.name}: {e}")
+            if target_path_tmp.exists():
+                target_path_tmp.unlink()
+            raise e
+
+        return True
+
+    @classmethod
+    def join_files(cls, folder: Path, use_trash: bool = False):
+        """
+        Escanea la carpeta buscando archivos .gc.### y los une.
+        Utiliza un archivo .tmp para la reconstrucción antes de renombrar al original.
+        Si use_trash es True, un archivo original previo va a la papelera en vez de sobrescribirse.
+        """
+        grupos = {}
+        for entry, match in cls._iter_chunks(os.fspath(folder)):
+            base_name, part_num = match.group(1), int(match.group(2))
+            chunk_file = Path(entry.path)
+            target_path = chunk_file.parent / base_name
+
+            if target_path not in grupos:
+                grupos[target_path] = []
+            grupos[target_path].append((part_num, chunk_file))
+
+        if not grupos:
+            logger.info("No se encontraron archivos fragmentados para unir.")
+            return
 
-                logger.info(f"¡Archivo '{target_path.name}' restaurado exitosamente!")
+        # Cada destino es independiente: se reconstruyen en paralelo.
+        workers = max(1, min(cls.MAX_WORKERS, len(grupos)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    cls._join_one, target_path, parts, use_trash
+                ): target_path
+                for target_path, parts in grupos.items()
+            }
 
-            except Exception as e:
-                logger.error(f"Fallo al unir {target_path.name}: {e}")
-                if target_path_tmp.exists():
-                    target_path_tmp.unlink()
-                raise e
+        fallidos = [futures[f].name for f in futures if f.exception() is not None]
+        if fallidos:
+            raise Exception(f"No se pudieron restaurar: {', '.join(fallidos)}")
@@ -254,7 +254,8 @@ def restore(
             "[bold green]Escaneando y reconstruyendo archivos...[/bold green]",
             spinner="bouncingBar",
         ):
-            FileChunker.join_files(path)
+            # Un archivo ya restaurado se envía a la papelera en vez de sobrescribirse.
+            FileChunker.join_files(path, use_trash=True)
 
         console.print(
             Panel.fit(
@@ -1,10 +1,11 @@
+import functools
 import json
 import logging
 import os
 import sys
 from os import getenv
 from pathlib import Path
-from typing import Dict, Optional, cast
+from typing import ClassVar, Dict, Optional, Tuple, cast
 
 from pydantic import BaseModel, ValidationError
 
@@ -22,8 +23,12 @@ class ConfigSchema(BaseModel):
     default_profile: Optional[str] = None
 
 
+@functools.cache
 def get_user_config_dir(app_name: str = "gitchunk") -> Path:
-    """Obtiene la ruta estándar de configuración según el SO."""
+    """
+    Obtiene la ruta estándar de configuración según el SO.
+    La plataforma y el entorno no cambian durante el proceso, así que se calcula una vez.
+    """
     if sys.platform.startswith("win"):
         return Path(cast(str, getenv("APPDATA"))) / app_name
     elif sys.platform == "darwin":
@@ -34,10 +39,14 @@ def get_user_config_dir(app_name: str = "gitchunk") -> Path:
 
 
 class ConfigManager:
+    # Caché por proceso: ruta -> ((mtime_ns, tamaño), configuración validada)
+    _cache: ClassVar[Dict[Path, Tuple[Tuple[int, int], ConfigSchema]]] = {}
+
     def __init__(self):
         self.config_dir = get_user_config_dir()
         self.config_file = self.config_dir / "config.json"
         self._ensure_dir()
+        self._last_written: Optional[str] = None
         self.data: ConfigSchema = self._load()
 
     def _ensure_dir(self):
@@ -45,22 +54,55 @@ class ConfigManager:
         if not self.config_dir.exists():
             self.config_dir.mkdir(parents=True, exist_ok=True)
 
+    def _stat_key(self) -> Tuple[int, int]:
+        stat = self.config_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+
     def _load(self) -> ConfigSchema:
-        """Carga la configuración desde el JSON o crea una vacía."""
+        """
+        Carga la configuración desde el JSON o crea una vacía.
+        Si el archivo no cambió (mtime y tamaño) desde la última lectura, reutiliza
+        la versión ya validada en lugar de volver a leer y validar el JSON.
+        """
         if not self.config_file.exists():
             return ConfigSchema()
 
+        key = self._stat_key()
+        cached = self._cache.get(self.config_file)
+        if cached and cached[0] == key:
+            self._last_written = cached[1].model_dump_json(indent=4)
+            return cached[1].model_copy(deep=True)
+
         try:
             content = self.config_file.read_text(encoding="utf-8")
-            return ConfigSchema.model_validate_json(content)
+            data = ConfigSchema.model_validate_json(content)
         except (ValidationError, json.JSONDecodeError):
             logger.warning("Archivo de configuración corrupto. Iniciando uno nuevo.")
             return ConfigSchema()
 
+        self._cache[self.config_file] = (key, data.model_copy(deep=True))
+        self._last_written = content
+        return data
+
     def save(self):
-        """Guarda el estado actual en el archivo JSON."""
+        """
+        Guarda el estado actual en el archivo JSON.
+        Se escribe a un temporal y se reemplaza con os.replace (atómico), así un
+        corte a mitad de escritura no deja el archivo corrupto. Si el contenido
+        no cambió respecto a lo último leído/escrito, no se toca el disco.
+        """
         content = self.data.model_dump_json(indent=4)
-        self.config_file.write_text(content, encoding="utf-8")
+        if content == self._last_written:
+            return
+
+        tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+        tmp_file.write_text(content, encoding="utf-8")
+        os.replace(tmp_file, self.config_file)
+        self._last_written = content
+        self._cache[self.config_file] = (
+            self._stat_key(),
+            self.data.model_copy(deep=True),
+        )
 
     def add_profile(self, name: str, token: str) -> bool:
         """
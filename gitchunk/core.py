@@ -1,21 +1,28 @@
 import logging
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Generator, Optional, Union
 
-from git import Actor, Repo, exc
+from git import Actor, Remote, Repo, exc
 
 from gitchunk.schemas import Batchs, FilesFiltered
 
+from .constants import PUSH_BATCH_SIZE
 from .git_manager import (
     check_git_user_email,
+    check_work_tree,
     create_commits,
+    ephemeral_remote,
     fix_dubious_ownership,
     get_git_status,
     get_problematic_git_configs,
     get_remote,
+    has_pending_changes,
     is_repo_new,
     push_commits_one_by_one,
     set_local_user_email,
+    set_status_performance_configs,
     sync_with_remote_shallow,
 )
 from .processing import (
@@ -28,12 +35,15 @@ logger = logging.getLogger(__name__)
 
 
 class GitchunkRepo:
-    def __init__(self, path: Path, token: Optional[str] = None):
-        self.path = path
+    def __init__(self, path: Union[str, Path], token: Optional[str] = None):
+        # Se normaliza una sola vez; el resto del pipeline recibe este mismo Path.
+        self.path = Path(path)
         self.repo = self._open_or_init()
         self.author: Optional[Actor] = None
         self.token = token
         self._remote_url: Optional[str] = None
+        # Remoto autenticado compartido mientras dure auth_remote().
+        self._auth_remote: Optional[Remote] = None
 
         self._branch_name: str = "master"
 
@@ -75,6 +85,14 @@ class GitchunkRepo:
 
         logger.info(f"Se han generado {commits_created} commits nuevos.")
 
+    @cached_property
+    def git_problems(self) -> list[dict]:
+        """
+        Configuraciones de Git que podrían ocultar archivos del juego.
+        Se consultan una vez por instancia: no cambian mientras se procesa el juego.
+        """
+        return get_problematic_git_configs(self.repo)
+
     @property
     def auth_url(self) -> Optional[str]:
         if not self._remote_url or not self.token:
@@ -88,26 +106,62 @@ class GitchunkRepo:
         self._set_remote(remote_url)
         self._checkout_target_branch(branch_name)
 
+    @contextmanager
+    def auth_remote(self) -> Generator[Remote, None, None]:
+        """
+        Crea UN remoto temporal con token para todas las operaciones de red del
+        bloque (synchronize, push), en lugar de un `remote add`/`remove` por cada una.
+        """
+        with ephemeral_remote(self.repo, self.auth_url, "temp_sync") as remote:
+            self._auth_remote = remote
+            try:
+                yield remote
+            finally:
+                self._auth_remote = None
+
     def synchronize(self):
         if self.auth_url:
-            return sync_with_remote_shallow(self.repo, self.auth_url, self._branch_name)
+            return sync_with_remote_shallow(
+                self.repo, self.auth_url, self._branch_name, remote=self._auth_remote
+            )
 
-    def push(self):
+    def push(
+        self,
+        batch_size: int = PUSH_BATCH_SIZE,
+        tag_name: Optional[str] = None,
+        force_tag: bool = False,
+    ):
         return push_commits_one_by_one(
-            repo=self.repo, auth_url=self.auth_url, branch_name=self._branch_name
+            repo=self.repo,
+            auth_url=self.auth_url,
+            branch_name=self._branch_name,
+            batch_size=batch_size,
+            tag_name=tag_name,
+            force_tag=force_tag,
+            remote=self._auth_remote,
         )
 
-    def analyze_changes(self) -> tuple[FilesFiltered, Batchs, list[dict]]:
+    def is_dirty_fast(self) -> bool:
+        """Indica si hay cambios pendientes, sin clasificar ni medir archivos."""
+        return has_pending_changes(self.repo)
+
+    def analyze_files(self) -> tuple[FilesFiltered, list[dict]]:
         """
-        Analiza el estado actual y prepara los lotes de cambios.
+        Clasifica los archivos del estado actual, sin calcular los lotes
+        (prepare_and_commit los calcula después del chunking).
         No realiza ninguna modificación en el repositorio.
         """
         logger.info("Analizando archivos para backup...")
-        git_problems = get_problematic_git_configs(self.repo)
-
         status = get_git_status(self.repo)
-
         files_filtered = filter_files_from_status(self.path, status)
+        return files_filtered, self.git_problems
+
+    def analyze_changes(self) -> tuple[FilesFiltered, Batchs, list[dict]]:
+        """
+        Analiza el estado actual y prepara los lotes de cambios.
+        No realiza ninguna modificación en el repositorio.
+        """
+        files_filtered, git_problems = self.analyze_files()
         batches = batch_files(files_filtered)
 
         return files_filtered, batches, git_problems
@@ -144,30 +198,31 @@ class GitchunkRepo:
 
     def _open_or_init(self) -> Repo:
         """Abre o inicializa el repo y verifica inmediatamente la propiedad."""
+        repo = None
         if not (self.path / ".git").exists():
             logger.info(f"Inicializando nuevo repositorio Git en {self.path}")
             repo = Repo.init(self.path)
-        else:
-            repo = Repo(self.path)
+            set_status_performance_configs(repo)
 
         try:
             # 'rev-parse --is-inside-work-tree' es un comando muy ligero
-            # que obliga a Git a validar el repositorio.
-            repo.git.rev_parse("--is-inside-work-tree")
+            # que obliga a Git a validar el repositorio. Se lanza antes de
+            # construir el Repo, que solo se crea si la validación pasa.
+            check_work_tree(self.path)
         except exc.GitCommandError as e:
             if "dubious ownership" in str(e).lower():
                 logger.warning(
                     f"Propiedad dudosa detectada en {self.path}. Intentando auto-reparación..."
                 )
                 if fix_dubious_ownership(self.path):
-                    return repo
+                    return repo or Repo(self.path)
                 else:
                     raise Exception(
                         "No se pudo resolver el problema de propiedad de Git."
                     )
             raise e
 
-        return repo
+        return repo or Repo(self.path)
 
     def _set_remote(self, remote_url: str, remote_name: str = "origin"):
         """Configura o actualiza la URL del remoto."""
@@ -183,6 +238,15 @@ class GitchunkRepo:
         """
         Asegura que el repositorio esté en la rama de la plataforma correcta.
         """
+        # Caso habitual al re-ejecutar: HEAD ya apunta a la rama. Se lee el
+        # archivo HEAD directamente, sin resolver refs ni lanzar git.
+        head_file = Path(self.repo.git_dir) / "HEAD"
+        try:
+            if head_file.read_text().strip() == f"ref: refs/heads/{branch_name}":
+                return
+        except OSError:
+            pass
+
         if is_repo_new(self.repo):
             # Si el repo es nuevo, cambiamos el nombre de la rama actual (HEAD)
             # de forma "silenciosa" sin activar las protecciones de checkout.
@@ -1,10 +1,33 @@
 import logging
+import os
+import shutil
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _normcase_set(names: Iterable[str]) -> frozenset:
+    """Normaliza los nombres como lo hace el SO (en Windows no distingue mayúsculas)."""
+    return frozenset(os.path.normcase(name) for name in names)
+
+
 class GameCleaner:
+    # Carpetas temporales y caches: se eliminan completas.
+    JUNK_DIRS = _normcase_set(["cache", "saves", "tmp", "__pycache__"])
+    # Extensión compilada -> extensión de su código fuente.
+    COMPILED_SOURCES = {".rpyc": ".rpy", ".rpymc": ".rpym"}
+    # Basura de SO y logs.
+    GARBAGE_NAMES = _normcase_set(
+        ["traceback.txt", "errors.txt", ".DS_Store", "thumbs.db", "log.txt"]
+    )
+    GARBAGE_SUFFIXES = tuple(os.path.normcase(s) for s in (".pyo", ".save", ".log"))
+    # Nunca se desciende al repositorio: ahí no hay nada que limpiar.
+    SKIP_DIRS = _normcase_set([".git"])
+    # unlink/rmdir bloquean en el kernel y liberan el GIL: varios hilos solapan la latencia.
+    MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
     def __init__(self, base_path: Path):
         self.path = base_path
 
@@ -15,78 +38,123 @@ class GameCleaner:
         """
         logger.info("Iniciando limpieza de archivos del juego...")
 
-        self._remove_junk_folders()
-        self._clean_compiled_scripts()
-        self._remove_system_garbage()
-
-    def _remove_junk_folders(self):
-        """Elimina carpetas temporales y caches."""
-        folders_to_nuke = ["**/cache", "**/saves", "**/tmp", "**/__pycache__"]
-
-        for pattern in folders_to_nuke:
-            for folder in self.path.glob(pattern):
-                if folder.is_dir():
-                    try:
-                        for sub in folder.glob("**/*"):
-                            if sub.is_file():
-                                sub.unlink()
-                            elif sub.is_dir():
-                                sub.rmdir()
-
-                        if not any(folder.iterdir()):
-                            folder.rmdir()
-                            logger.debug(f"Carpeta eliminada: {folder.name}")
-                    except Exception as e:
-                        logger.warning(f"No se pudo borrar carpeta {folder}: {e}")
-
-    def _clean_compiled_scripts(self):
+        junk_folders, compiled, kept, garbage = self._scan()
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            self._remove_junk_folders(junk_folders, executor)
+            self._clean_compiled_scripts(compiled, kept, executor)
+            self._remove_system_garbage(garbage, executor)
+
+    def _scan(self) -> Tuple[List[str], List[str], List[str], List[str]]:
+        """
+        Recorre el árbol del juego UNA sola vez con os.scandir y clasifica cada
+        entrada según las reglas. Las carpetas basura no se recorren: se borran enteras.
+        El listado de cada carpeta sirve también para saber si un compilado tiene
+        su fuente al lado, sin un stat extra por archivo.
+
+        Retorna (carpetas_basura, compilados_a_borrar, compilados_conservados, basura).
+        """
+        junk_folders: List[str] = []
+        compiled: List[str] = []
+        kept: List[str] = []
+        garbage: List[str] = []
+
+        pending = [os.fspath(self.path)]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.warning("No se pudo leer la carpeta %s: %s", current, e)
+                continue
+
+            names = {os.path.normcase(entry.name) for entry in entries}
+            for entry in entries:
+                name = os.path.normcase(entry.name)
+
+                if entry.is_dir(follow_symlinks=False):
+                    if name in self.JUNK_DIRS:
+                        junk_folders.append(entry.path)
+                    elif name not in self.SKIP_DIRS:
+                        pending.append(entry.path)
+                    continue
+
+                if not entry.is_file():
+                    continue
+
+                stem, ext = os.path.splitext(name)
+                source_ext = self.COMPILED_SOURCES.get(ext)
+                if source_ext:
+                    if stem + source_ext in names:
+                        compiled.append(entry.path)
+                    else:
+                        kept.append(entry.path)
+                elif name in self.GARBAGE_NAMES or name.endswith(self.GARBAGE_SUFFIXES):
+                    garbage.append(entry.path)
+
+        return junk_folders, compiled, kept, garbage
+
+    @staticmethod
+    def _unlink(path: str) -> Optional[OSError]:
+        """Borra un archivo y devuelve el error (si lo hubo) en lugar de lanzarlo."""
+        try:
+            os.unlink(path)
+        except OSError as e:
+            return e
+        return None
+
+    @staticmethod
+    def _remove_tree(folder: str) -> Optional[Exception]:
+        """
+        Elimina la carpeta completa. shutil.rmtree usa en POSIX operaciones relativas
+        a un descriptor (unlinkat/rmdir) sin resolver la ruta de cada entrada.
+        """
+        try:
+            shutil.rmtree(folder)
+        except Exception as e:
+            return e
+        return None
+
+    def _remove_junk_folders(self, folders: List[str], executor: Executor):
+        """Elimina carpetas temporales y caches (una tarea por carpeta)."""
+        for folder, error in zip(folders, executor.map(self._remove_tree, folders)):
+            if error:
+                logger.warning("No se pudo borrar carpeta %s: %s", folder, error)
+            else:
+                logger.debug("Carpeta eliminada: %s", os.path.basename(folder))
+
+    def _clean_compiled_scripts(
+        self, compiled: List[str], kept: List[str], executor: Executor
+    ):
         """
         Elimina archivos compilados (.rpyc, .rpymc) SOLO si existe su fuente (.rpy, .rpym).
         """
         count_deleted = 0
-        count_kept = 0
-
-        # Lista de (patrón_compilado, extensión_fuente)
-        targets = [("**/*.rpyc", ".rpy"), ("**/*.rpymc", ".rpym")]
-
-        for pattern, source_ext in targets:
-            for compiled_file in self.path.glob(pattern):
-                source_file = compiled_file.with_suffix(source_ext)
-
-                if source_file.exists():
-                    try:
-                        compiled_file.unlink()
-                        count_deleted += 1
-                    except OSError as e:
-                        logger.error(f"Error borrando {compiled_file.name}: {e}")
-                else:
-                    count_kept += 1
-                    logger.debug(
-                        f"Conservado {compiled_file.name} (no se encontró código fuente {source_ext})"
-                    )
+
+        results = executor.map(self._unlink, compiled, chunksize=64)
+        for compiled_file, error in zip(compiled, results):
+            if error:
+                logger.error(
+                    "Error borrando %s: %s", os.path.basename(compiled_file), error
+                )
+            else:
+                count_deleted += 1
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for compiled_file in kept:
+                logger.debug(
+                    "Conservado %s (no se encontró su código fuente)",
+                    os.path.basename(compiled_file),
+                )
 
         logger.info(
-            f"Limpieza de scripts: {count_deleted} eliminados, {count_kept} conservados por seguridad."
+            "Limpieza de scripts: %d eliminados, %d conservados por seguridad.",
+            count_deleted,
+            len(kept),
         )
 
-    def _remove_system_garbage(self):
-        """Elimina basura de SO y logs."""
-        patterns = [
-            "**/*.pyo",
-            "**/*.save",
-            "**/traceback.txt",
-            "**/errors.txt",
-            "**/.DS_Store",
-            "**/thumbs.db",
-            "**/*.log",
-            "**/log.txt",
-            "**/traceback.txt",
-        ]
-
-        for pattern in patterns:
-            for file in self.path.glob(pattern):
-                if file.is_file():
-                    try:
-                        file.unlink()
-                    except Exception:
-                        pass
+    def _remove_system_garbage(self, garbage: List[str], executor: Executor):
+        """Elimina basura de SO y logs (los fallos se ignoran)."""
+        for _ in executor.map(self._unlink, garbage, chunksize=64):
+            pass
@@ -2,12 +2,11 @@ import logging
 import random
 from datetime import timedelta
 from pathlib import Path
+from typing import Optional
 
-from git import Repo
-
-from gitchunk.git_manager import ephemeral_remote
+from gitchunk.git_manager import get_tag_commit
 from gitchunk.github_api import GitHubClient
-from gitchunk.parsing import get_comparable_version, grouped_by_platform
+from gitchunk.parsing import get_comparable_version, versions_for_platform
 from gitchunk.utils import sleep_progress
 
 from ..core import GitchunkRepo
@@ -20,11 +19,26 @@ logger = logging.getLogger(__name__)
 class GameManager:
     def __init__(self, acces_token: str):
         self.token = acces_token
+        self._github_client: Optional[GitHubClient] = None
+        # Si este manager ya subió algo: la pausa anti-abuso solo se hace entre pushes.
+        self._has_pushed = False
+        # (usuario, repo) -> (url_remota o None, etiquetas remotas).
+        self._tags_cache: dict[tuple[str, str], tuple[Optional[str], list[str]]] = {}
+
+    @property
+    def github_client(self) -> GitHubClient:
+        """
+        Cliente de GitHub compartido por todos los juegos que procese este manager.
+        Se crea al primer uso y se reutiliza en cada process_game.
+        """
+        if self._github_client is None:
+            self._github_client = GitHubClient(token=self.token)
+        return self._github_client
 
     def process_game(self, game_path: Path):
         logger.info(f"=== Iniciando procesamiento de juego en: {game_path} ===")
 
-        github_client = GitHubClient(token=self.token)
+        github_client = self.github_client
         scanner = GameScanner(game_path)
         cleaner = GameCleaner(game_path)
         repo_wrapper = GitchunkRepo(game_path, token=self.token)
@@ -37,15 +51,13 @@ class GameManager:
         logger.info(f"Versión Detectada: {metadata.version}")
         logger.info(f"Plataforma: {metadata.platform}")
 
-        username = github_client.get_authenticated_user()
-        if github_client.repo_exists(username, metadata.repo_name):
-            remote_tags = github_client.get_remote_tags(username, metadata.repo_name)
-            grouped = grouped_by_platform(remote_tags)
-            exists_platform = metadata.platform in grouped
-            if exists_platform:
+        remote_url, remote_tags = self._get_remote_state(metadata.repo_name)
+        if remote_url:
+            platform_versions = versions_for_platform(remote_tags, metadata.platform)
+            if platform_versions:
                 # Gracias al no aceptar la degresion de version, se da por hecho que la version MAYOR subida de esa plataforma es la mas reciente.
                 latest_remote_version = max(
-                    [get_comparable_version(v) for v in grouped[metadata.platform]]
+                    map(get_comparable_version, platform_versions)
                 )
                 if metadata.version < latest_remote_version:
                     logger.error(
@@ -56,58 +68,121 @@ class GameManager:
                         f"Regresión detectada: {metadata.display_version} < {latest_remote_version}"
                     )
 
-        remote_url = github_client.get_or_create_repo(metadata.repo_name)
-        auth_url = github_client.get_auth_url(remote_url)
+        if remote_url:
+            logger.info(f"El repositorio '{metadata.repo_name}' ya existe en GitHub.")
+        else:
+            logger.info(f"Creando nuevo repositorio privado: '{metadata.repo_name}'")
+            remote_url = github_client.create_private_repo(metadata.repo_name)
+            self._update_remote_state(metadata.repo_name, remote_url)
 
         cleaner.clean()
         repo_wrapper.ensure_identity()
         repo_wrapper.configure_endpoint(remote_url, metadata.branch_name)
-        repo_wrapper.synchronize()
-
-        files_report, _, git_problems = repo_wrapper.analyze_changes()
-        if files_report.invalid_files:
-            logger.warning("=== ARCHIVOS OMITIDOS POR TAMAÑO ===")
-            for fname, size, reason in files_report.invalid_files:
-                logger.warning(f"  [X] {fname} ({size / 1024**2:.2f} MB) -> {reason}")
-            logger.warning("====================================")
-            return False
-
-        if git_problems:
-            logger.warning(
-                f"Configuración de Git detectada: {git_problems[0]['config']}"
-            )
+        # Un solo remoto autenticado para sincronizar y subir.
+        with repo_wrapper.auth_remote():
+            repo_wrapper.synchronize()
+
+            should_force_tag = False
+            new_commits = []
+            # Caso habitual al re-ejecutar: nada cambió. Se evita clasificar y medir
+            # todo el árbol y se pasa directo a la lógica del tag.
+            if not repo_wrapper.is_dirty_fast():
+                logger.info("No hay cambios respecto al último commit.")
+            else:
+                # Los lotes se calculan una sola vez, en prepare_and_commit.
+                files_report, git_problems = repo_wrapper.analyze_files()
+                if files_report.invalid_files:
+                    logger.warning("=== ARCHIVOS OMITIDOS POR TAMAÑO ===")
+                    for fname, size, reason in files_report.invalid_files:
+                        logger.warning(
+                            "  [X] %s (%.2f MB) -> %s", fname, size / 1024**2, reason
+                        )
+                    logger.warning("====================================")
+                    return False
+
+                if git_problems:
+                    logger.warning(
+                        f"Configuración de Git detectada: {git_problems[0]['config']}"
+                    )
 
-        should_force_tag = False
-        for commit in repo_wrapper.prepare_and_commit(files_report):
-            if commit:
-                repo_wrapper.push()
-                should_force_tag = True
-                seconds = timedelta(minutes=random.randint(1, 10)).total_seconds()
-                sleep_progress(seconds)
-
-        tag_created = self._ensure_tag(
-            repo_wrapper, metadata.display_version, force=should_force_tag
-        )
-        if tag_created:
-            logger.info(
-                f"Etiqueta {metadata.display_version} {'actualizada' if should_force_tag else 'creada'}."
-            )
-            self.push_tag_securely(
-                repo_wrapper.repo,
-                auth_url,
-                metadata.display_version,
-                force=should_force_tag,
+                # Todos los commits se crean primero (no dependen de pushes intermedios)
+                # y se suben juntos con el tag en un único push al final.
+                new_commits = [
+                    commit
+                    for commit in repo_wrapper.prepare_and_commit(files_report)
+                    if commit
+                ]
+                should_force_tag = bool(new_commits)
+
+            tag_created = self._ensure_tag(
+                repo_wrapper, metadata.display_version, force=should_force_tag
             )
+            if tag_created:
+                logger.info(
+                    f"Etiqueta {metadata.display_version} {'actualizada' if should_force_tag else 'creada'}."
+                )
+
+            if new_commits or tag_created:
+                self._wait_between_pushes()
+                # Commits + tag en un solo push (el tag va con el último lote).
+                repo_wrapper.push(
+                    tag_name=metadata.display_version if tag_created else None,
+                    force_tag=should_force_tag,
+                )
+                if tag_created:
+                    self._update_remote_state(
+                        metadata.repo_name,
+                        remote_url,
+                        pushed_tag=metadata.display_version,
+                    )
 
         logger.info(f"=== Proceso finalizado para {metadata.save_id} ===")
 
+    def _wait_between_pushes(self):
+        """
+        Pausa aleatoria de 1 a 10 minutos antes de cada push salvo el primero,
+        para no saturar GitHub cuando se procesan varios juegos seguidos.
+        """
+        if self._has_pushed:
+            seconds = timedelta(minutes=random.randint(1, 10)).total_seconds()
+            sleep_progress(seconds)
+        self._has_pushed = True
+
+    def _get_remote_state(self, repo_name: str) -> tuple[Optional[str], list[str]]:
+        """
+        Devuelve (url_remota o None, etiquetas) del repositorio. La primera vez usa
+        el preflight (usuario, repo y tags en una petición); las siguientes, la cache.
+        """
+        username = self.github_client.username
+        if username is not None and (username, repo_name) in self._tags_cache:
+            logger.debug("Estado remoto de '%s' tomado de la cache.", repo_name)
+            return self._tags_cache[(username, repo_name)]
+
+        username, remote_url, remote_tags = self.github_client.preflight(repo_name)
+        self._tags_cache[(username, repo_name)] = (remote_url, remote_tags)
+        return remote_url, remote_tags
+
+    def _update_remote_state(
+        self, repo_name: str, remote_url: str, pushed_tag: Optional[str] = None
+    ):
+        """
+        Refleja en la cache lo que este mismo proceso cambió en GitHub (repo creado,
+        tag subido), así el siguiente juego del mismo repo no vuelve a consultarlo.
+        """
+        key = (self.github_client.username, repo_name)
+        _, tags = self._tags_cache.get(key, (None, []))
+        if pushed_tag and pushed_tag not in tags:
+            tags = [*tags, pushed_tag]
+        self._tags_cache[key] = (remote_url, tags)
+
     def _ensure_tag(
         self, gitchunk: GitchunkRepo, tag_name: str, force: bool = False
     ) -> bool:
         """Crea o mueve el tag. Retorna True si se operó sobre el tag."""
         repo = gitchunk.repo
 
-        if tag_name in repo.tags:
+        tagged_commit = get_tag_commit(repo, tag_name)
+        if tagged_commit:
             if not force:
                 logger.warning(
                     f"El tag '{tag_name}' ya existe localmente. Saltando creación."
@@ -115,30 +190,13 @@ class GameManager:
                 return False
 
             # Si el tag ya apunta al commit actual, no hacemos nada
-            if repo.tags[tag_name].commit == repo.head.commit:
+            if tagged_commit == repo.head.commit.hexsha:
                 logger.info(f"El tag '{tag_name}' ya está al día con el último commit.")
                 return False
 
             logger.info(f"Moviendo tag '{tag_name}' al nuevo commit...")
-            repo.delete_tag(tag_name)  # type: ignore
+            repo.create_tag(tag_name, force=True)
+            return True
 
         repo.create_tag(tag_name)
         return True
-
-    def push_tag_securely(
-        self, repo: Repo, auth_url: str, tag_name: str, force: bool = False
-    ):
-        with ephemeral_remote(repo, auth_url, "temp_tag_push") as remote:
-            logger.info(f"Subiendo etiqueta {tag_name} (force={force})...")
-
-            # El prefijo '+' en el refspec fuerza la actualización del tag en el remoto
-            prefix = "+" if force else ""
-            refspec = f"{prefix}refs/tags/{tag_name}:refs/tags/{tag_name}"
-
-            infos = remote.push(refspec)
-            for info in infos:
-                if info.flags & (info.ERROR | info.REJECTED):
-                    logger.error(f"Error al subir tag {tag_name}: {info.summary}")
-                    raise Exception(f"Fallo al subir el tag: {info.summary}")
-                else:
-                    logger.info(f"Tag {tag_name} subido exitosamente: {info.summary}")
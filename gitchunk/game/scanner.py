@@ -1,7 +1,10 @@
 import logging
+import mmap
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from packaging.version import Version
 from pydantic import BaseModel
@@ -10,6 +13,49 @@ from gitchunk.parsing import get_comparable_version
 
 logger = logging.getLogger(__name__)
 
+# Patrón fuerte: v1.0, 1.2.3, 2023.01
+_VERSION_STRONG_RE = re.compile(
+    r"(?:v|ver\.?|version)\s*(\d+(?:\.\d+)+[a-z0-9\-]*)", re.IGNORECASE
+)
+# Patrón numérico simple: 0.5, 1.0 (al menos un punto)
+_VERSION_SIMPLE_RE = re.compile(r"(\d+\.\d+(?:\.\d+)?)")
+_REPO_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9\-_]")
+# Marcas de plataforma en el nombre de la carpeta (ej: Juego-1.0-linux).
+_PLATFORM_RE = re.compile(r"-(android|apk|mac|ios|linux)", re.IGNORECASE)
+_PLATFORM_TOKENS = {
+    "android": "android",
+    "apk": "android",
+    "mac": "mac",
+    "ios": "mac",
+    "linux": "linux",
+}
+_PLATFORM_PRIORITY = ("android", "mac", "linux")
+
+
+@lru_cache(maxsize=8)
+def _renpy_variables_pattern(variable_names: tuple[str, ...]) -> re.Pattern[bytes]:
+    """
+    Regex de las asignaciones Ren'Py (ej: config.version = "1.0") de varias variables
+    a la vez: grupo 1 = nombre, grupo 2 = valor. Se compila una vez por combinación.
+    Trabaja sobre bytes: los archivos se buscan sin decodificarlos.
+    """
+    names = b"|".join(re.escape(name.encode("utf-8")) for name in variable_names)
+    return re.compile(rb'(%s)\s*=\s*["\']([^"\']+)["\']' % names)
+
+
+def _collect_assignments(
+    pattern: re.Pattern[bytes], data: bytes | mmap.mmap, variable_names: tuple[str, ...]
+) -> dict[str, str]:
+    """Primer valor de cada variable en `data`; se detiene al tenerlas todas."""
+    found: dict[str, str] = {}
+    for match in pattern.finditer(data):
+        name = match.group(1).decode("utf-8")
+        if name not in found:
+            found[name] = match.group(2).decode("utf-8", "ignore")
+            if len(found) == len(variable_names):
+                break
+    return found
+
 
 class GameMetadata(BaseModel):
     executable_name: str
@@ -20,7 +66,7 @@ class GameMetadata(BaseModel):
 
     @property
     def repo_name(self) -> str:
-        safe_id = re.sub(r"[^a-zA-Z0-9\-_]", "-", self.save_id).lower()
+        safe_id = _REPO_SANITIZE_RE.sub("-", self.save_id).lower()
         return f"gitchunk-game-{safe_id}"
 
     @property
@@ -41,9 +87,44 @@ class GameMetadata(BaseModel):
         return f"platform/{self.platform}"
 
 
+class RootScan(NamedTuple):
+    """Resultado del listado de la carpeta raíz del juego."""
+
+    candidates: list[str]  # Nombres de posibles ejecutables, en orden de listado.
+    has_exe: bool
+    has_sh: bool
+    has_app: bool
+    has_apk: bool
+
+
 class GameScanner:
+    # Orden de preferencia: el código fuente antes que el compilado.
+    OPTIONS_FILES = ("options.rpy", "options.rpyc")
+    # Profundidad máxima del recorrido de respaldo al buscar options.rpy.
+    OPTIONS_MAX_DEPTH = 2
+    # Ejecutables candidatos de la raíz ("" = binario sin extensión).
+    EXECUTABLE_SUFFIXES = frozenset({".exe", ".sh", ".app", ""})
+    EXECUTABLE_BLACKLIST = frozenset(
+        {
+            "python.exe",
+            "pythonw.exe",
+            "zsync.exe",
+            "unrpyc.exe",
+            "dxwebsetup.exe",
+            "python",
+            "pythonw",
+            "zsync",
+            "uninstall.exe",
+        }
+    )
+    UNINSTALLERS = frozenset({"unins000.exe", "uninstall.exe"})
+    # Variables de options.rpy que necesita el escaneo (se leen juntas).
+    RENPY_VARIABLES = ("config.version", "config.save_directory")
+
     def __init__(self, base_path: Path | str):
         self.path = Path(base_path)
+        self._root_scan: Optional[RootScan] = None
+        self._renpy_vars: Optional[dict[str, str]] = None
 
     def scan(self) -> GameMetadata:
         """Ejecuta todo el proceso de escaneo e identificación."""
@@ -65,37 +146,105 @@ class GameScanner:
 
     def _get_renpy_variable(self, variable_name: str) -> Optional[str]:
         """
-        Busca una variable (ej: config.version) en todos los archivos options.rpy/rpyc
-        dentro del proyecto.
+        Busca una variable (ej: config.version) en los archivos options.rpy/rpyc
+        del proyecto (ver _find_options_files). Las de RENPY_VARIABLES se leen
+        todas en una sola pasada y quedan guardadas en la instancia.
         """
-        pattern = re.compile(rf'{variable_name}\s*=\s*["\']([^"\']+)["\']')
+        if variable_name not in self.RENPY_VARIABLES:
+            return self._get_renpy_vars((variable_name,)).get(variable_name)
 
-        # Buscar archivos options.rpy y options.rpyc en cualquier profundidad
-        potential_files = sorted(
-            self.path.rglob("options.rpy*"),
-            key=lambda p: p.suffix,  # .rpy aparecerá antes que .rpyc
-            reverse=True,
-        )
+        if self._renpy_vars is None:
+            self._renpy_vars = self._get_renpy_vars(self.RENPY_VARIABLES)
+        return self._renpy_vars.get(variable_name)
+
+    def _get_renpy_vars(self, variable_names: tuple[str, ...]) -> dict[str, str]:
+        """
+        Extrae varias variables leyendo cada archivo una sola vez. Se detiene en cuanto
+        las tiene todas, y no abre un .rpyc si ya se leyó el .rpy de su misma carpeta
+        (el compilado sale de ese mismo código fuente).
+        """
+        pattern = _renpy_variables_pattern(variable_names)
+        values: dict[str, str] = {}
+        seen_parents: set[Path] = set()
+
+        # _find_options_files entrega el .rpy antes que el .rpyc de cada carpeta.
+        for config_file in self._find_options_files():
+            if config_file.suffix == ".rpyc" and config_file.parent in seen_parents:
+                continue
 
-        for config_file in potential_files:
             try:
-                if config_file.suffix == ".rpy":
-                    content = config_file.read_text(encoding="utf-8", errors="ignore")
-                else:
-                    # Para .rpyc leemos como binario y decodificamos ignorando errores
-                    content = config_file.read_bytes().decode("utf-8", "ignore")
-
-                match = pattern.search(content)
-                if match:
-                    value = match.group(1)
-                    logger.debug(
-                        f"Encontrado {variable_name}='{value}' en {config_file}"
-                    )
-                    return value
+                found = self._search_in_file(config_file, pattern, variable_names)
             except Exception as e:
-                logger.debug(f"No se pudo leer {config_file}: {e}")
+                logger.debug("No se pudo leer %s: %s", config_file, e)
+                continue
+            # Solo un .rpy leído con éxito hace innecesario el .rpyc de al lado.
+            if config_file.suffix == ".rpy":
+                seen_parents.add(config_file.parent)
+
+            for name, value in found.items():
+                if name not in values:
+                    logger.debug("Encontrado %s='%s' en %s", name, value, config_file)
+                    values[name] = value
+            if len(values) == len(variable_names):
+                break
+
+        return values
+
+    @staticmethod
+    def _search_in_file(
+        path: Path, pattern: re.Pattern[bytes], variable_names: tuple[str, ...]
+    ) -> dict[str, str]:
+        """
+        Busca las asignaciones en el archivo, decodificando solo los valores hallados.
+        Los .rpyc (pueden pesar varios MB) se buscan sobre un mmap, sin copiarlos a memoria.
+        """
+        if path.suffix != ".rpyc":
+            return _collect_assignments(pattern, path.read_bytes(), variable_names)
 
-        return None
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return {}  # mmap no admite archivos vacíos
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # Los valores se extraen antes de cerrar el mmap.
+                return _collect_assignments(pattern, mapped, variable_names)
+
+    def _find_options_files(self) -> list[Path]:
+        """
+        Localiza options.rpy/rpyc sin recorrer todos los assets del juego.
+        Primero mira las rutas habituales (game/ y la raíz); solo si no hay ninguno,
+        prueba el bundle de Mac y un recorrido limitado a OPTIONS_MAX_DEPTH niveles.
+        """
+        candidates = [
+            base / name
+            for base in (self.path / "game", self.path)
+            for name in self.OPTIONS_FILES
+        ]
+        found = [path for path in candidates if path.is_file()]
+        if found:
+            return found
+
+        # Builds de Mac: el juego vive dentro de <Nombre>.app/Contents/Resources/autorun.
+        for game_dir in self.path.glob("*.app/Contents/Resources/autorun/game"):
+            found.extend(
+                game_dir / name
+                for name in self.OPTIONS_FILES
+                if (game_dir / name).is_file()
+            )
+        if found:
+            return found
+
+        root = os.fspath(self.path)
+        for dirpath, dirnames, filenames in os.walk(root):
+            depth = dirpath[len(root) :].count(os.sep)
+            if depth >= self.OPTIONS_MAX_DEPTH:
+                dirnames.clear()
+            else:
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            names = set(filenames)
+            found.extend(
+                Path(dirpath, name) for name in self.OPTIONS_FILES if name in names
+            )
+        return found
 
     def _get_renpy_config_version(self) -> Optional[str]:
         return self._get_renpy_variable("config.version")
@@ -108,29 +257,51 @@ class GameScanner:
             )
         return save_id
 
+    def _scan_root_once(self) -> RootScan:
+        """
+        Lista la carpeta raíz UNA sola vez con os.scandir y reúne lo que necesitan
+        _find_executable y _analyze_files_for_platform. El tipo de cada entrada
+        viene del propio listado (sin stat extra salvo en enlaces simbólicos).
+        El resultado queda guardado en la instancia.
+        """
+        if self._root_scan is not None:
+            return self._root_scan
+
+        candidates: list[str] = []
+        has_exe = has_sh = has_app = has_apk = False
+
+        with os.scandir(self.path) as it:
+            for entry in it:
+                name_lower = entry.name.lower()
+                if name_lower.startswith("."):
+                    continue
+                ext = os.path.splitext(name_lower)[1]
+
+                if entry.is_file():
+                    if (
+                        ext in self.EXECUTABLE_SUFFIXES
+                        and name_lower not in self.EXECUTABLE_BLACKLIST
+                    ):
+                        candidates.append(entry.name)
+
+                    if ext == ".exe" and name_lower not in self.UNINSTALLERS:
+                        has_exe = True
+                    elif ext == ".sh":
+                        has_sh = True
+                    elif ext == ".apk":
+                        has_apk = True
+
+                elif entry.is_dir():
+                    # En Mac, las aplicaciones son carpetas terminadas en .app
+                    if ext == ".app":
+                        has_app = True
+
+        self._root_scan = RootScan(candidates, has_exe, has_sh, has_app, has_apk)
+        return self._root_scan
+
     def _find_executable(self) -> str:
         """Busca el ejecutable principal del juego."""
-        blacklist = {
-            "python.exe",
-            "pythonw.exe",
-            "zsync.exe",
-            "unrpyc.exe",
-            "dxwebsetup.exe",
-            "python",
-            "pythonw",
-            "zsync",
-            "uninstall.exe",
-        }
-
-        candidates = []
-        for file in self.path.iterdir():
-            if not file.is_file():
-                continue
-
-            if file.suffix.lower() in [".exe", ".sh", ".app"] or file.suffix == "":
-                if file.name.lower() not in blacklist and not file.name.startswith("."):
-                    candidates.append(file)
-
+        candidates = self._scan_root_once().candidates
         if not candidates:
             raise FileNotFoundError(
                 "No se encontró ningún ejecutable válido en la carpeta raíz."
@@ -138,22 +309,18 @@ class GameScanner:
 
         # Heurística simple: el archivo más grande suele ser el ejecutable real en RenPy (a veces)
         # Por ahora devolvemos el primero o priorizamos .exe
-        exe_files = [f for f in candidates if f.suffix.lower() == ".exe"]
+        exe_files = [name for name in candidates if name.lower().endswith(".exe")]
         target = exe_files[0] if exe_files else candidates[0]
 
-        return target.stem
+        return Path(target).stem
 
     def _extract_version(self, text: str) -> str:
         """Extrae versión usando Regex en cascada."""
-        # Patrón fuerte: v1.0, 1.2.3, 2023.01
-        regex_strong = re.search(
-            r"(?:v|ver\.?|version)\s*(\d+(?:\.\d+)+[a-z0-9\-]*)", text, re.IGNORECASE
-        )
+        regex_strong = _VERSION_STRONG_RE.search(text)
         if regex_strong:
             return regex_strong.group(1)
 
-        # Patrón numérico simple: 0.5, 1.0 (al menos un punto)
-        regex_simple = re.search(r"(\d+\.\d+(?:\.\d+)?)", text)
+        regex_simple = _VERSION_SIMPLE_RE.search(text)
         if regex_simple:
             return regex_simple.group(1)
 
@@ -167,52 +334,24 @@ class GameScanner:
         """Deduce la plataforma"""
         # NOTA: otra forma de identificar es mirar dentro de `lib/`
         # parecen cosas como `py3-windows-x86_64`, `py3-linux-x86_64`
-        text_lower = text.lower()
 
-        if "-android" in text_lower or "-apk" in text_lower:
-            return "android"
-        if "-mac" in text_lower or "-ios" in text_lower:
-            return "mac"
-        if "-linux" in text_lower:
-            return "linux"
-        if "-pc" in text_lower or "-win" in text_lower or "-windows" in text_lower:
-            # Nota: A veces "-pc" significa "todas las plataformas de escritorio"
-            # Podríamos refinarlo mirando los archivos,
-            # pero por ahora lo dejamos dejamos que el análisis de archivos lo confirme.
-            pass
+        # Todas las marcas en una sola pasada; si hay varias, manda el orden de prioridad.
+        found = {
+            _PLATFORM_TOKENS[token.lower()] for token in _PLATFORM_RE.findall(text)
+        }
+        for platform in _PLATFORM_PRIORITY:
+            if platform in found:
+                return platform
 
+        # "-pc", "-win" o "-windows" no bastan: a veces "-pc" significa "todas las
+        # plataformas de escritorio", así que el análisis de archivos lo confirma.
         return self._analyze_files_for_platform()
 
     def _analyze_files_for_platform(self) -> str:
         """
-        Escanea la carpeta raíz para determinar la plataforma según los ejecutables.
+        Determina la plataforma según los ejecutables de la carpeta raíz.
         """
-        has_exe = False
-        has_sh = False
-        has_app = False
-        has_apk = False
-
-        for item in self.path.iterdir():
-            name_lower = item.name.lower()
-
-            if name_lower.startswith("."):
-                continue
-
-            if item.is_file():
-                if item.suffix.lower() == ".exe" and name_lower not in [
-                    "unins000.exe",
-                    "uninstall.exe",
-                ]:
-                    has_exe = True
-                elif item.suffix.lower() == ".sh":
-                    has_sh = True
-                elif item.suffix.lower() == ".apk":
-                    has_apk = True
-
-            elif item.is_dir():
-                # En Mac, las aplicaciones son carpetas terminadas en .app
-                if item.suffix.lower() == ".app":
-                    has_app = True
+        _, has_exe, has_sh, has_app, has_apk = self._scan_root_once()
 
         if has_apk:
             return "android"
@@ -1,12 +1,18 @@
-import configparser
 import logging
-from contextlib import contextmanager
+import os
+import stat
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Generator, Optional, cast, get_args
+from typing import Generator, Optional, get_args
 
 import git
 from git import Actor, GitCommandError, List, Remote, Repo
+from git.config import get_config_path
+from git.exc import InvalidGitRepositoryError, NoSuchPathError
 from git.types import Lit_config_levels
 
 from .schemas import (
@@ -21,6 +27,9 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Procesos `git hash-object` simultáneos al escribir blobs (zlib usa un núcleo por proceso).
+HASH_OBJECT_WORKERS = min(8, os.cpu_count() or 1)
+
 
 @contextmanager
 def ephemeral_remote(
@@ -32,8 +41,9 @@ def ephemeral_remote(
         with ephemeral_remote(repo, url_con_token) as remote:
             remote.push(...)
     """
+    # Se consulta solo ese remoto, sin listar (ni parsear) todos los de la config.
     remote = Remote(repo, remote_name)
-    if remote in repo.remotes:
+    if remote.exists():
         logger.warning(
             f"Remoto temporal {remote_name} encontrado y eliminado antes de usar."
         )
@@ -43,63 +53,113 @@ def ephemeral_remote(
     try:
         yield remote
     finally:
-        if remote_name in repo.remotes:
+        try:
             repo.delete_remote(remote)
+        except GitCommandError:
+            pass  # Ya lo eliminó otra operación
+
+
+def _use_or_create_remote(repo: Repo, auth_url: str, remote: Optional[Remote]):
+    """Reutiliza el remoto recibido o abre uno temporal ("temp_sync") para la operación."""
+    if remote is not None:
+        return nullcontext(remote)
+    return ephemeral_remote(repo, auth_url, "temp_sync")
 
 
-def get_sync_status(repo: Repo, remote: Remote, branch_name: str) -> SyncStatus:
+def resolve_commit(repo: Repo, rev: str) -> Optional[str]:
+    """
+    Hexsha del commit al que apunta `rev` (sha, ref o tag), o None si no existe.
+    Usa el `git cat-file --batch-check` persistente de GitPython: una línea por
+    consulta sobre un proceso ya abierto, en lugar de lanzar git cada vez.
+    """
+    try:
+        hexsha, _, _ = repo.git.get_object_header(f"{rev}^{{commit}}")
+    except ValueError:
+        return None
+    return hexsha.decode("ascii")
+
+
+def has_commit(repo: Repo, sha: str) -> bool:
+    """Indica si el commit ya está en la base de objetos local (sin tocar la red)."""
+    return resolve_commit(repo, sha) is not None
+
+
+def get_sync_status(
+    repo: Repo, remote: Remote, branch_name: str
+) -> tuple[SyncStatus, Optional[str]]:
     """
     Determina la relación topológica entre el HEAD local y la rama remota.
-    No modifica el repositorio.
+    Retorna (estado, sha_remoto). No modifica el historial local.
+
+    El sha de la punta remota se obtiene con ls-remote (sin pack); solo si ese
+    commit no está ya en local se hace el fetch (--depth=1 si local está vacío).
     """
     try:
-        remote_refs = repo.git.ls_remote(remote.name, branch_name)
+        remote_refs = repo.git.ls_remote(remote.name, f"refs/heads/{branch_name}")
     except GitCommandError:
-        return SyncStatus.NO_REMOTE
+        return SyncStatus.NO_REMOTE, None
 
     if not remote_refs:
-        return SyncStatus.NO_REMOTE
-
-    remote.fetch(branch_name, depth=1)
-    remote_ref = f"{remote.name}/{branch_name}"
-
-    if is_repo_new(repo):
-        return SyncStatus.BEHIND  # Si local está vacío, técnicamente estamos "atrás".
+        return SyncStatus.NO_REMOTE, None
 
-    local_commit = repo.head.commit
-    remote_commit = repo.commit(remote_ref)
+    remote_commit = remote_refs.split()[0]
+    # HEAD se resuelve una sola vez: None indica un repositorio sin commits.
+    local_commit = get_head_sha(repo)
 
     if local_commit == remote_commit:
-        return SyncStatus.EQUAL
+        return SyncStatus.EQUAL, remote_commit
+
+    if not has_commit(repo, remote_commit):
+        # Solo hacen falta los objetos: sin escribir FETCH_HEAD (ni que GitPython
+        # lo vuelva a leer para armar la lista de FetchInfo).
+        # Con historial local no se usa --depth=1: la punta quedaría injertada sin
+        # padres y el local nunca aparecería como su ancestro (BEHIND -> DIVERGED).
+        # La negociación de git ya limita la descarga a los commits que faltan.
+        depth = ["--depth=1"] if local_commit is None else []
+        repo.git.fetch(
+            *depth,
+            "--no-write-fetch-head",
+            remote.name,
+            f"refs/heads/{branch_name}",
+        )
 
-    # Análisis de Ancestros
-    # ¿Es el remoto un ancestro del local? -> Entonces vamos ganando (AHEAD)
-    try:
-        if repo.is_ancestor(remote_commit, local_commit):
-            return SyncStatus.AHEAD
-    except GitCommandError:
-        pass
+    if local_commit is None:
+        # Si local está vacío, técnicamente estamos "atrás".
+        return SyncStatus.BEHIND, remote_commit
 
-    # ¿Es el local un ancestro del remoto? -> Entonces vamos perdiendo (BEHIND)
+    # Análisis de Ancestros en un solo proceso: cuántos commits tiene cada lado
+    # que el otro no. Equivale a los dos `merge-base --is-ancestor` por separado.
     try:
-        if repo.is_ancestor(local_commit, remote_commit):
-            return SyncStatus.BEHIND
-    except GitCommandError:
-        pass
+        counts = repo.git.rev_list(
+            "--left-right", "--count", f"{remote_commit}...{local_commit}"
+        )
+        only_remote, only_local = map(int, counts.split())
+    except (GitCommandError, ValueError):
+        return SyncStatus.DIVERGED, remote_commit
+
+    # El remoto es ancestro del local -> Entonces vamos ganando (AHEAD)
+    if only_remote == 0:
+        return SyncStatus.AHEAD, remote_commit
+
+    # El local es ancestro del remoto -> Entonces vamos perdiendo (BEHIND)
+    if only_local == 0:
+        return SyncStatus.BEHIND, remote_commit
 
     # Si no es ninguno de los anteriores, han divergido
-    return SyncStatus.DIVERGED
+    return SyncStatus.DIVERGED, remote_commit
 
 
-def sync_with_remote_shallow(repo: Repo, auth_url: str, branch_name: str) -> bool:
+def sync_with_remote_shallow(
+    repo: Repo, auth_url: str, branch_name: str, remote: Optional[Remote] = None
+) -> bool:
     """
     Sincroniza el repositorio local actuando según el estado detectado.
+    Si se recibe `remote` se usa tal cual; si no, se crea uno temporal.
     """
     logger.info("Verificando estado de sincronización con el remoto...")
 
-    with ephemeral_remote(repo, auth_url, "temp_sync") as remote:
-        status = get_sync_status(repo, remote, branch_name)
-        remote_ref = f"{remote.name}/{branch_name}"
+    with _use_or_create_remote(repo, auth_url, remote) as remote:
+        status, remote_commit = get_sync_status(repo, remote, branch_name)
 
         match status:
             case SyncStatus.NO_REMOTE:
@@ -124,7 +184,7 @@ def sync_with_remote_shallow(repo: Repo, auth_url: str, branch_name: str) -> boo
                 logger.info(
                     "ESTADO: BEHIND (Update). Actualizando base local al último commit remoto..."
                 )
-                repo.git.reset(remote_ref)
+                repo.git.reset(remote_commit)
                 return True
 
             case SyncStatus.DIVERGED:
@@ -132,30 +192,32 @@ def sync_with_remote_shallow(repo: Repo, auth_url: str, branch_name: str) -> boo
                     "ESTADO: DIVERGED. Las historias han divergido. "
                     "Se forzará la alineación al remoto (reset --soft) manteniendo archivos."
                 )
-                repo.git.reset("--soft", remote_ref)
+                repo.git.reset("--soft", remote_commit)
                 return True
 
         return False
 
 
+def check_work_tree(path: Path) -> None:
+    """
+    Valida con `git rev-parse --is-inside-work-tree` que `path` es un repositorio
+    utilizable, sin construir un objeto Repo. Lanza GitCommandError si git lo rechaza
+    (por ejemplo, "dubious ownership").
+    """
+    with _git_process(
+        ["rev-parse", "--is-inside-work-tree"], cwd=path, stdout=subprocess.DEVNULL
+    ):
+        pass
+
+
 def fix_dubious_ownership(path: Path) -> bool:
     """
     Intenta marcar el directorio como seguro para Git de forma global.
     """
-    import subprocess
-
     try:
-        subprocess.run(
-            [
-                "git",
-                "config",
-                "--global",
-                "--add",
-                "safe.directory",
-                str(path.absolute()),
-            ],
-            check=True,
-        )
+        args = ["config", "--global", "--add", "safe.directory", str(path.absolute())]
+        with _git_process(args, cwd=path):
+            pass
         logger.info(f"Directorio {path} marcado como seguro exitosamente.")
         return True
     except Exception as e:
@@ -189,69 +251,145 @@ def get_git_status(repo: Repo):
     - "untracked": Archivos que no están en el index ni en algún commit,
       respetando .gitignore.
     """
-    if repo.head.is_valid():
-        repo.index.reset()
+    status = _read_git_status(repo)
+
+    # Lo habitual es que no haya nada en stage; solo si una ejecución interrumpida
+    # dejó entradas, se devuelven al working tree con un `git reset` nativo (que
+    # conserva la información de stat del index) y se vuelve a leer el estado.
+    if any(status["staged"].values()) and repo.head.is_valid():
+        logger.info("Quitando del stage cambios de una ejecución anterior...")
+        run_git(repo, "reset", "-q")
+        status = _read_git_status(repo)
 
-    unstaged = StatusUnstaged(modified=[], deleted=[], untracked=repo.untracked_files)
+    return status
+
+
+def _read_git_status(repo: Repo) -> GitStatus:
+    """Clasifica la salida de `git status` tal cual está el index (ver get_git_status)."""
+    unstaged = StatusUnstaged(modified=[], deleted=[], untracked=[])
     staged = StatusStaged(added=[], modified=[], deleted=[], renamed=[])
 
-    # repo.index.diff(None) Devuelve los archivos modificados o eliminados que aún no has pasado al stage.
-    # repo.index.diff(None) No devuelve los archivos untracked, porque aún no existe en el index (se obtienen con repo.untracked_files)
-    # repo.untracked_files Devuelve la lista archivos que no están en el index ni en ningún commit, respetando .gitignore
-    for diff in repo.index.diff(None):
-        a_path = cast(str, diff.a_path)
-        if (
-            diff.change_type == "M"
-        ):  # Archivo existente modificado, no se ha agregado a stage.
-            unstaged["modified"].append(a_path)
-        elif (
-            diff.change_type == "D"
-        ):  # Archivo existente eliminado, no se ha agregado a stage.
-            unstaged["deleted"].append(a_path)
+    # Una sola llamada a `git status` devuelve staged, unstaged y untracked; git solo
+    # hace stat de los archivos que necesita en lugar de recorrer el árbol desde Python.
+    # Formato -z (porcelain v2), un registro por entrada separado por NUL:
+    #   1 XY sub mH mI mW hH hI <ruta>              -> entrada modificada
+    #   2 XY sub mH mI mW hH hI Xscore <ruta>\0<orig> -> entrada renombrada
+    #   ? <ruta>                                    -> untracked (respeta .gitignore)
+    # X es el estado en el stage (index vs HEAD) e Y el del working tree (vs index).
+    # --no-renames evita la detección de similitud (un renombrado llega como
+    # eliminado + nuevo, que es como lo procesa batch_files) y --ignore-submodules
+    # evita entrar en repos anidados dentro de la carpeta del juego.
+    # Los registros se procesan a medida que git los escribe, sin esperar al final.
+    records = iter_git_records(
+        repo,
+        "status",
+        "--porcelain=v2",
+        "-z",
+        "--untracked-files=all",
+        "--no-renames",
+        "--ignore-submodules=all",
+    )
+    for record in records:
+        if not record:
+            continue
+
+        kind = record[:1]
+        if kind == b"?":
+            unstaged["untracked"].append(os.fsdecode(record[2:]))
+            continue
+        elif kind == b"1":
+            fields = record.split(b" ", 8)
+        elif kind == b"2":
+            fields = record.split(b" ", 9)
         else:
-            logger.error(f"Unknown change type: {diff.change_type}")
-
-    if not is_repo_new(repo):
-        for diff in repo.index.diff("HEAD"):
-            a_path = cast(str, diff.a_path)
-            if diff.change_type == "A":  # Archivo nuevo añadido a stage.
-                staged["added"].append(a_path)
-            elif (
-                diff.change_type == "M"
-            ):  # Archivo existente modificado y añadido a stage.
-                staged["modified"].append(a_path)
-            elif (
-                diff.change_type == "D"
-            ):  # Archivo existente eliminado y añadido a stage.
-                staged["deleted"].append(a_path)
-            elif (
-                diff.change_type == "R"
-            ):  # Archivo existente renombrado y añadido a stage.
-                rename_from = cast(str, diff.rename_from)
-                rename_to = cast(str, diff.rename_to)
-                staged["renamed"].append(
-                    FileRename(old_name=rename_from, new_name=rename_to)
-                )
-            else:
-                logger.error(f"Unknown change type: {diff.change_type}")
-    else:
-        for path, _stage in repo.index.entries.keys():
-            path = cast(str, path)
+            logger.error(f"Unknown status record: {os.fsdecode(record)}")
+            continue
+
+        path = os.fsdecode(fields[-1])
+        index_status, worktree_status = fields[1].decode()
+
+        if kind == b"2":  # Archivo existente renombrado y añadido a stage.
+            old_name = os.fsdecode(next(records))
+            staged["renamed"].append(FileRename(old_name=old_name, new_name=path))
+        elif index_status == "A":  # Archivo nuevo añadido a stage.
             staged["added"].append(path)
+        elif index_status in "MT":  # Archivo existente modificado y añadido a stage.
+            staged["modified"].append(path)
+        elif index_status == "D":  # Archivo existente eliminado y añadido a stage.
+            staged["deleted"].append(path)
+        elif index_status != ".":
+            logger.error(f"Unknown change type: {index_status}")
+
+        if worktree_status in "MT":  # Modificado, no se ha agregado a stage.
+            unstaged["modified"].append(path)
+        elif worktree_status == "D":  # Eliminado, no se ha agregado a stage.
+            unstaged["deleted"].append(path)
+        elif worktree_status != ".":
+            logger.error(f"Unknown change type: {worktree_status}")
 
     return GitStatus(staged=staged, unstaged=unstaged)
 
 
-def push_commits_one_by_one(repo, auth_url, branch_name):
-    with ephemeral_remote(repo, auth_url, "temp_sync") as sync_remote:
-        sync_remote.fetch()
-
-        remote_ref = f"{sync_remote.name}/{branch_name}"
+def has_pending_changes(repo: Repo) -> bool:
+    """
+    Responde "¿hay algo que respaldar?" sin construir el estado completo.
+    `git diff --quiet HEAD` termina en el primer cambio de un archivo versionado y
+    de los untracked basta con leer el primer registro de `ls-files`.
+    """
+    if repo.head.is_valid():
+        # Código 1 = hay diferencias: no es un error.
+        with _git_process(
+            ["diff", "--quiet", "--ignore-submodules=all", "HEAD", "--"],
+            cwd=repo.working_tree_dir,
+            git_env=repo.git.environment(),
+            ok_returncodes=(0, 1),
+        ) as process:
+            pass
+        if process.returncode == 1:
+            return True
+        args = ["ls-files", "-z", "--others", "--exclude-standard"]
+    else:
+        # Sin commits cualquier archivo (en el index o fuera de él) es un cambio.
+        args = ["ls-files", "-z", "--cached", "--others", "--exclude-standard"]
 
+    records = iter_git_records(repo, *args)
+    try:
+        return next(records, None) is not None
+    finally:
+        records.close()
+
+
+def push_commits_one_by_one(
+    repo,
+    auth_url,
+    branch_name,
+    batch_size: int = 1,
+    tag_name: Optional[str] = None,
+    force_tag: bool = False,
+    remote: Optional[Remote] = None,
+):
+    """
+    Sube los commits pendientes en orden, de `batch_size` en `batch_size`.
+    Empujar un commit envía también sus ancestros, así que cada lote se sube
+    empujando solo su último commit: una negociación de pack por lote.
+    Con batch_size=1 cada commit viaja en su propio push.
+
+    Si se indica `tag_name`, el tag viaja en el último push junto con la rama
+    (--atomic: se actualizan ambos o ninguno), sin abrir otra conexión.
+    Si se recibe `remote` se usa tal cual; si no, se crea uno temporal.
+    """
+    with _use_or_create_remote(repo, auth_url, remote) as sync_remote:
+        # Solo interesa la rama destino: no se traen ni se escriben las demás refs.
+        remote_ref = f"refs/remotes/{sync_remote.name}/{branch_name}"
         try:
-            repo.git.rev_parse("--verify", remote_ref)
-            rev_range = f"{remote_ref}..{branch_name}"
+            sync_remote.fetch(refspec=f"refs/heads/{branch_name}:{remote_ref}")
         except GitCommandError:
+            pass  # La rama aún no existe en el remoto
+
+        # Nombre completo: se resuelve directo, sin probar rutas ambiguas.
+        if resolve_commit(repo, remote_ref):
+            rev_range = f"{remote_ref}..{branch_name}"
+        else:
             # Si no existe (repositorio nuevo o rama nueva),
             # tomamos todos los commits de la rama local
             logger.info(
@@ -259,14 +397,182 @@ def push_commits_one_by_one(repo, auth_url, branch_name):
             )
             rev_range = branch_name
 
-        commits = list(repo.iter_commits(rev_range))
-
-        for index, commit in enumerate(reversed(commits), start=1):
-            sync_remote.push(
-                refspec=f"{commit.hexsha}:refs/heads/{branch_name}",
-                force_with_lease=True,
+        # Solo hacen falta los hexsha (del más antiguo al más reciente): un único
+        # rev-list da el orden y el total, sin construir objetos Commit.
+        hexshas = repo.git.rev_list("--reverse", rev_range).split()
+        total = len(hexshas)
+
+        tag_refspec = None
+        if tag_name:
+            # El prefijo '+' fuerza la actualización del tag en el remoto
+            prefix = "+" if force_tag else ""
+            tag_refspec = f"{prefix}refs/tags/{tag_name}:refs/tags/{tag_name}"
+
+        batch_size = max(1, batch_size)
+        for index, hexsha in enumerate(hexshas, start=1):
+            if index % batch_size and index != total:
+                continue
+            refspecs = [f"{hexsha}:refs/heads/{branch_name}"]
+            if tag_refspec and index == total:
+                refspecs.append(tag_refspec)
+            infos = sync_remote.push(
+                refspec=refspecs,
+                # La protección se limita a la rama: el tag se controla con '+'.
+                force_with_lease=f"refs/heads/{branch_name}",
+                atomic=len(refspecs) > 1,
             )
-            logger.info(f"Push commit {commit.hexsha} exitoso")
+            check_push_infos(infos)
+            logger.info(f"[{index}/{total}] Push commit {hexsha} exitoso")
+
+        if tag_refspec and total == 0:
+            # Sin commits pendientes: solo viaja el tag.
+            check_push_infos(sync_remote.push(refspec=tag_refspec))
+
+        if tag_refspec:
+            logger.info(f"Tag {tag_name} subido exitosamente.")
+
+
+def check_push_infos(infos) -> None:
+    """Lanza una excepción si alguna ref del push fue rechazada o falló."""
+    for info in infos:
+        if info.flags & (info.ERROR | info.REJECTED):
+            logger.error(f"Error al subir {info.remote_ref_string}: {info.summary}")
+            raise Exception(f"Fallo al subir: {info.summary}")
+
+
+@contextmanager
+def _git_process(
+    args: List[str],
+    cwd,
+    git_env: Optional[dict] = None,
+    ok_returncodes: tuple[int, ...] = (0,),
+    **popen_kwargs,
+) -> Generator[subprocess.Popen, None, None]:
+    """
+    Lanza el ejecutable de git que usa GitPython (GIT_PYTHON_GIT_EXECUTABLE) y
+    entrega el proceso. Al salir del bloque espera a que termine y lanza
+    GitCommandError si su código no está en `ok_returncodes`; si el bloque se
+    interrumpe, mata el proceso. stderr va a un archivo temporal (sin riesgo de
+    bloquear el pipe) y se adjunta al error. `git_env` se suma al entorno actual.
+    """
+    command = [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", *args]
+    env = {**os.environ, **git_env} if git_env else None
+    with (
+        tempfile.TemporaryFile() as stderr,
+        subprocess.Popen(
+            command, cwd=cwd, env=env, stderr=stderr, **popen_kwargs
+        ) as process,
+    ):
+        try:
+            yield process
+        except BaseException:
+            if process.poll() is None:
+                process.kill()
+            raise
+
+        returncode = process.wait()
+        if returncode not in ok_returncodes:
+            stderr.seek(0)
+            raise GitCommandError(command, returncode, stderr.read())
+
+
+def run_git(repo: Repo, *args: str, input: Optional[bytes] = None) -> bytes:
+    """
+    Ejecuta un comando git en el working tree del repo y devuelve su stdout.
+    A diferencia de repo.git, permite alimentar stdin con bytes (listas -z).
+    """
+    with _git_process(
+        list(args),
+        cwd=repo.working_tree_dir,
+        git_env=repo.git.environment(),
+        stdin=subprocess.PIPE if input is not None else None,
+        stdout=subprocess.PIPE,
+    ) as process:
+        stdout, _ = process.communicate(input)
+    return stdout
+
+
+def iter_git_records(repo: Repo, *args: str, chunk_size: int = 64 * 1024):
+    """
+    Ejecuta un comando git con salida -z y produce cada registro (bytes) en cuanto
+    llega por el pipe. Así el parseo en Python se solapa con el trabajo de git y
+    nunca se retiene la salida completa en memoria.
+    Si el consumidor corta antes de tiempo, el proceso se mata (no queda colgado).
+    """
+    with _git_process(
+        list(args),
+        cwd=repo.working_tree_dir,
+        git_env=repo.git.environment(),
+        stdout=subprocess.PIPE,
+    ) as process:
+        pending = b""
+        for chunk in iter(lambda: process.stdout.read(chunk_size), b""):
+            *records, pending = (pending + chunk).split(b"\0")
+            yield from records
+        if pending:
+            yield pending
+
+
+def write_blobs_parallel(
+    repo: Repo, files: List[str], workers: int = HASH_OBJECT_WORKERS
+) -> None:
+    """
+    Escribe los blobs de `files` en la base de objetos repartiéndolos entre varios
+    `git hash-object -w --stdin-paths` simultáneos. Lo caro de escribir un blob es
+    comprimirlo (zlib, un solo hilo por proceso); así se usan varios núcleos.
+
+    Es solo un precalentamiento: update-index encuentra después los objetos ya
+    escritos y se limita a calcular el hash. Por eso los errores se ignoran y los
+    casos especiales (enlaces simbólicos, nombres que --stdin-paths no admite) se
+    dejan a update-index.
+    """
+    sized = []
+    for file in files:
+        if "\n" in file or file.startswith('"'):
+            continue
+        try:
+            st = os.lstat(os.path.join(repo.working_tree_dir, file))
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            sized.append((st.st_size, file))
+
+    workers = min(workers, len(sized))
+    if workers < 2:
+        return
+
+    # Reparto por tamaño (de mayor a menor, en turnos) para equilibrar la carga.
+    sized.sort(reverse=True)
+    shards = [sized[i::workers] for i in range(workers)]
+    git_env = repo.git.environment()
+
+    def hash_shard(shard):
+        paths = "".join(f"{file}\n" for _, file in shard)
+        try:
+            with _git_process(
+                ["hash-object", "-w", "--stdin-paths"],
+                cwd=repo.working_tree_dir,
+                git_env=git_env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+            ) as process:
+                process.communicate(os.fsencode(paths))
+        except GitCommandError:
+            pass  # update-index se encarga de lo que no se pudo escribir aquí
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(hash_shard, shards))
+
+
+def add_files_to_index(repo: Repo, files: List[str]) -> None:
+    """
+    Añade (o actualiza) los archivos en el index con un único proceso
+    `git update-index --add -z --stdin`: git hashea los blobs y escribe el index una vez.
+    Los blobs se escriben antes en paralelo (write_blobs_parallel).
+    """
+    write_blobs_parallel(repo, files)
+    paths = b"".join(os.fsencode(f) + b"\0" for f in files)
+    run_git(repo, "update-index", "--add", "-z", "--stdin", input=paths)
 
 
 def batch_list(items, batch_size):
@@ -275,15 +581,60 @@ def batch_list(items, batch_size):
 
 
 def remove_files_from_index(repo: Repo, files: List[str]) -> None:
-    for batch in batch_list(files, 100):
-        try:
-            repo.index.remove(batch, working_tree=True)
-        except GitCommandError as e:
-            try:
-                for i in batch:
-                    repo.index.remove(i, working_tree=True)
-            except GitCommandError as e:
-                logger.error(f"Error al eliminar archivos: {e}")
+    """
+    Quita los archivos del index (y del working tree si aún existen) con un único
+    `git rm` que lee las rutas por stdin: una sola escritura del index para todo el lote.
+    """
+    if not files:
+        return
+
+    paths = b"".join(os.fsencode(f) + b"\0" for f in files)
+    # Rutas literales: nombres con '*' o '[' no se interpretan como globs.
+    # --ignore-unmatch: los originales recién troceados suelen no estar en el index,
+    # y sin él git rm abortaría el lote entero por una sola ruta ausente.
+    try:
+        run_git(
+            repo,
+            "--literal-pathspecs",
+            "rm",
+            "-q",
+            "--ignore-unmatch",
+            "--pathspec-from-file=-",
+            "--pathspec-file-nul",
+            input=paths,
+        )
+    except GitCommandError as e:
+        logger.error(f"Error al eliminar archivos: {e}")
+
+
+def commit_index(repo: Repo, message: str, author: Actor) -> git.Commit:
+    """
+    Confirma el index actual con plumbing de git: write-tree arma el árbol desde el
+    index en C (GitPython lo recorre en Python), commit-tree crea el commit y
+    update-ref mueve la rama de HEAD, comprobando que nadie la movió entretanto.
+    El autor se usa también como committer. No ejecuta hooks.
+    """
+    tree = repo.git.write_tree()
+    parent = get_head_sha(repo)
+
+    args = [tree, "-m", message]
+    if parent:
+        args += ["-p", parent]
+    identity = {
+        "GIT_AUTHOR_NAME": author.name,
+        "GIT_AUTHOR_EMAIL": author.email,
+        "GIT_COMMITTER_NAME": author.name,
+        "GIT_COMMITTER_EMAIL": author.email,
+    }
+    with repo.git.custom_environment(**identity):
+        hexsha = repo.git.commit_tree(*args)
+
+    reflog = f"commit: {message}" if parent else f"commit (initial): {message}"
+    # Valor anterior vacío = la rama aún no debe existir (primer commit).
+    repo.git.update_ref("-m", reflog, "HEAD", hexsha, parent or "")
+
+    # Objeto perezoso: solo se lee de la base de objetos si se pide algo más que el sha.
+    return git.Commit(repo, bytes.fromhex(hexsha))
 
 
 def create_commits(
@@ -293,7 +644,8 @@ def create_commits(
     current_step = 1
 
     def get_timestamp():
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Mismo formato que strftime("%Y-%m-%d %H:%M:%S"), sin interpretar el patrón.
+        return datetime.now().isoformat(sep=" ", timespec="seconds")
 
     if batchs["to_delete"]:
         num_deleted = len(batchs["to_delete"])
@@ -304,7 +656,7 @@ def create_commits(
         remove_files_from_index(repo, batchs["to_delete"])
 
         msg = f"Batch {current_step}/{total_steps} | Delete {num_deleted} files | {get_timestamp()}"
-        commit = repo.index.commit(msg, author=author, committer=author)
+        commit = commit_index(repo, msg, author)
         yield commit
         current_step += 1
 
@@ -318,19 +670,35 @@ def create_commits(
             f"[{current_step}/{total_steps}] Añadiendo {num_files} archivos: {sample_files}"
         )
 
-        repo.index.add(files)
+        add_files_to_index(repo, files)
 
         msg = f"Batch {current_step}/{total_steps} | Add {num_files} files | {get_timestamp()}"
-        commit = repo.index.commit(msg, author=author, committer=author)
+        commit = commit_index(repo, msg, author)
 
         yield commit
 
-        logger.debug(f"Commit {commit.hexsha[:7]} creado exitosamente.")
+        logger.debug("Commit %.7s creado exitosamente.", commit.hexsha)
         current_step += 1
 
     logger.info(f"Proceso de commits finalizado.")
 
 
+def get_tag_commit(repo: Repo, tag_name: str) -> Optional[str]:
+    """
+    Devuelve el hexsha del commit al que apunta el tag, o None si no existe.
+    Resuelve solo esa ref (loose o packed) sin enumerar el resto de tags.
+    """
+    return resolve_commit(repo, f"refs/tags/{tag_name}")
+
+
+def get_head_sha(repo: Repo) -> Optional[str]:
+    """Hexsha del commit de HEAD, o None si la rama aún no tiene commits."""
+    try:
+        return repo.head.commit.hexsha
+    except (OSError, ValueError):
+        return None
+
+
 def is_repo_new(repo: Repo):
     """Devuelve True si el repositorio es nuevo. Un repositorio es nuevo si no tiene commits."""
     # try:
@@ -342,31 +710,84 @@ def is_repo_new(repo: Repo):
     #     # BadName → referencia no válida
     #     # GitCommandError → fallo al ejecutar comando git
     #     return True
-    return not repo.head.is_valid()
+    return get_head_sha(repo) is None
+
+
+# Nivel de configuración de GitPython -> opción equivalente de `git config`.
+# "global" y "user" no se piden con --global: git mezcla ahí ~/.gitconfig con el
+# archivo XDG (y escribe en este si ~/.gitconfig no existe). Se apuntan con --file.
+CONFIG_LEVEL_FLAGS = {
+    "system": "--system",
+    "repository": "--local",
+}
+
+
+def get_config_level_args(level: Lit_config_levels) -> list[str]:
+    """Argumentos de `git config` que limitan la lectura/escritura a un solo nivel."""
+    if level in CONFIG_LEVEL_FLAGS:
+        return [CONFIG_LEVEL_FLAGS[level]]
+    return ["--file", get_config_path(level)]
 
 
 def set_local_user_email(
     repo: Repo, name, email, level: Lit_config_levels = "repository"
 ) -> CheckUserEmail:
-    with repo.config_writer(config_level=level) as config:
-        config.set_value("user", "name", name)
-        config.set_value("user", "email", email)
+    args = get_config_level_args(level)
+    if level == "user":
+        # git no crea la carpeta del archivo XDG (~/.config/git) si aún no existe.
+        Path(get_config_path("user")).parent.mkdir(parents=True, exist_ok=True)
+    repo.git.config(*args, "user.name", name)
+    repo.git.config(*args, "user.email", email)
 
     return check_git_user_email(repo, level)
 
 
 def get_explicit_user_email(repo: Repo):
-    explicit = {}
-
-    for level in get_args(Lit_config_levels):
-        try:
-            config = repo.config_reader(config_level=level)
-            name = config.get_value("user", "name")
-            email = config.get_value("user", "email")
-            explicit[level] = {"user.name": name, "user.email": email}
-        except (KeyError, configparser.NoOptionError, configparser.NoSectionError):
+    """
+    Devuelve {nivel: {"user.name", "user.email"}} de cada nivel de configuración que
+    define ambas claves. Un solo `git config --show-scope --show-origin` lee todos los
+    archivos de una vez, en lugar de abrir y parsear cada uno con config_reader.
+    """
+    try:
+        output = repo.git.config(
+            "-z",
+            "--show-scope",
+            "--show-origin",
+            "--get-regexp",
+            r"^user\.(name|email)$",
+        )
+    except GitCommandError:
+        return {}  # Ningún nivel define user.name ni user.email
+
+    # Alcance de git -> nivel de GitPython. El alcance "global" incluye también el
+    # archivo XDG, que GitPython llama nivel "user".
+    user_path = os.path.normcase(get_config_path("user"))
+    values: dict[str, dict[str, str]] = {}
+
+    # Formato -z: "alcance\0origen\0clave\nvalor\0" por entrada.
+    records = output.split("\0")
+    for scope, origin, entry in zip(records[0::3], records[1::3], records[2::3]):
+        if scope == "local":
+            level = "repository"
+        elif scope == "system":
+            level = "system"
+        elif scope == "global":
+            origin_path = os.path.normcase(os.path.expanduser(origin[len("file:") :]))
+            level = "user" if origin_path == user_path else "global"
+        else:
             continue
+        key, _, value = entry.partition("\n")
+        values.setdefault(level, {})[key] = value
 
+    # Orden de los niveles como en Lit_config_levels; solo los que tienen ambas claves.
+    explicit = {}
+    for level in get_args(Lit_config_levels):
+        found = values.get(level, {})
+        if "user.name" in found and "user.email" in found:
+            explicit[level] = {
+                "user.name": found["user.name"],
+                "user.email": found["user.email"],
+            }
     return explicit
 
 
@@ -375,9 +796,14 @@ def set_safe_repo(repo: git.Repo) -> None:
 
 
 def is_safe_repo(repo: git.Repo) -> bool:
+    """
+    Indica si git acepta el repositorio (safe.directory / propietario). La
+    verificación de propiedad ocurre al descubrir el repo, así que basta con
+    `rev-parse` (check_work_tree): no hace falta el recorrido completo de `git status`.
+    """
     try:
-        repo.git.status()
-        print("Repositorio seguro ")
+        check_work_tree(Path(repo.working_tree_dir))
+        logger.debug("Repositorio seguro")
         return True
     except GitCommandError as e:
         if "dubious ownership" in str(e):
@@ -387,28 +813,36 @@ def is_safe_repo(repo: git.Repo) -> bool:
 
 
 def get_remote(repo: Repo, remote_name: str = "origin") -> Optional[Remote]:
-    for remote in repo.remotes:
-        if remote.name == remote_name:
-            return remote
-    return None
+    """Devuelve el remoto por nombre (o None) sin recorrer la lista de remotos."""
+    try:
+        return repo.remote(remote_name)
+    except ValueError:
+        return None
 
 
 def check_git_user_email(repo: Repo, level: Lit_config_levels) -> CheckUserEmail:
-    config = repo.config_reader(config_level=level)
-
+    """
+    Lee user.name y user.email del nivel indicado con una sola llamada a
+    `git config --get-regexp`, sin parsear los archivos de configuración en Python.
+    """
     user_name = None
     user_email = None
 
-    # Intenta obtener user.name y user.email
     try:
-        user_name = cast(str, config.get_value("user", "name"))
-    except (KeyError, configparser.NoOptionError, configparser.NoSectionError):
-        pass
+        output = repo.git.config(
+            *get_config_level_args(level), "-z", "--get-regexp", r"^user\.(name|email)$"
+        )
+    except GitCommandError:
+        # Código 1: ninguna de las dos claves está definida en ese nivel.
+        output = ""
 
-    try:
-        user_email = cast(str, config.get_value("user", "email"))
-    except (KeyError, configparser.NoOptionError, configparser.NoSectionError):
-        pass
+    # Formato -z: "clave\nvalor\0" por entrada; gana el último valor de cada clave.
+    for record in output.split("\0"):
+        key, _, value = record.partition("\n")
+        if key == "user.name":
+            user_name = value
+        elif key == "user.email":
+            user_email = value
 
     return CheckUserEmail(
         user_name=user_name,
@@ -417,16 +851,32 @@ def check_git_user_email(repo: Repo, level: Lit_config_levels) -> CheckUserEmail
     )
 
 
-def init_repo(folder: Path | str) -> Repo:
-    folder = Path(folder) if isinstance(folder, str) else folder
-    if isinstance(folder, str):
-        folder = Path(folder)
+def set_status_performance_configs(repo: Repo) -> None:
+    """
+    Activa en el repo las opciones que aceleran `git status` en árboles grandes:
+    - feature.manyFiles: index versión 4 (rutas comprimidas, index más pequeño de
+      leer y escribir) y core.untrackedCache, que cachea en el index los directorios
+      sin cambios para no volver a listarlos al buscar archivos untracked.
+    - core.preloadindex: git hace el lstat de las entradas del index en paralelo.
+    El index solo lo leen y escriben procesos de git (update-index, write-tree...),
+    nunca GitPython, que no sabe leer la versión 4.
+    """
+    with repo.config_writer(config_level="repository") as config:
+        config.set_value("feature", "manyFiles", "true")
+        config.set_value("core", "preloadindex", "true")
+        config.set_value("core", "untrackedCache", "true")
 
-    if not (folder / ".git").exists():
+
+def init_repo(folder: Path | str) -> Repo:
+    folder = Path(folder)
+    # Abrir directamente resuelve también un `.git` que sea archivo (worktrees,
+    # submódulos); solo si no es un repositorio se inicializa uno nuevo.
+    try:
+        return Repo(folder, search_parent_directories=False)
+    except (InvalidGitRepositoryError, NoSuchPathError):
         repo = Repo.init(folder)
+        set_status_performance_configs(repo)
         return repo
-    else:
-        return Repo((folder / ".git"))
 
 
 def get_problematic_git_configs(repo: Repo) -> list[dict]:
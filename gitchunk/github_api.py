@@ -1,13 +1,31 @@
 import json
 import logging
+from typing import Optional
 from urllib.error import HTTPError
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from gitchunk.schemas import TokenInfo
 
 logger = logging.getLogger(__name__)
 
+# Usuario del token, repositorio y sus tags en una sola petición.
+PREFLIGHT_QUERY = """
+query($name: String!, $cursor: String) {
+  viewer {
+    login
+    repository(name: $name) {
+      refs(refPrefix: "refs/tags/", first: 100, after: $cursor) {
+        nodes { name }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  }
+}
+"""
+
 
 class GitHubClient:
     def __init__(self, token: str):
@@ -18,6 +36,26 @@ class GitHubClient:
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
         }
+        self.session = self._build_session()
+        # Login del dueño del token: no cambia mientras viva el cliente.
+        self._user: Optional[str] = None
+
+    def _build_session(self) -> requests.Session:
+        """
+        Sesión HTTP reutilizada por todas las llamadas: la conexión TLS con la API se
+        abre una vez y queda en el pool. Los GET se reintentan ante errores 5xx transitorios.
+        """
+        session = requests.Session()
+        session.headers.update(self.headers)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+        session.mount("https://", adapter)
+        return session
 
     def verify_token(self) -> TokenInfo:
         """
@@ -25,7 +63,7 @@ class GitHubClient:
         """
         url = f"{self.base_url}/user"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             response.raise_for_status()
 
             data = response.json()
@@ -46,19 +84,26 @@ class GitHubClient:
                 )
             raise e
 
+    @property
+    def username(self) -> Optional[str]:
+        """Login ya conocido del dueño del token (None si aún no se consultó)."""
+        return self._user
+
     def get_authenticated_user(self) -> str:
-        """Obtiene el 'login' (username) del dueño del token."""
-        url = f"{self.base_url}/user"
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-        data = response.json()
-        return data["login"]
+        """Obtiene el 'login' (username) del dueño del token. Se consulta una sola vez."""
+        if self._user is None:
+            url = f"{self.base_url}/user"
+            response = self.session.get(url)
+            response.raise_for_status()
+            data = response.json()
+            self._user = data["login"]
+        return self._user
 
     def repo_exists(self, owner: str, repo_name: str) -> bool:
         """Comprueba si un repositorio ya existe."""
         try:
             url = f"{self.base_url}/repos/{owner}/{repo_name}"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             return response.status_code == 200
         except HTTPError as e:
             if e.code == 404:
@@ -75,7 +120,7 @@ class GitHubClient:
         data = json.dumps(payload).encode("utf-8")
 
         url = f"{self.base_url}/user/repos"
-        response = requests.post(url, data=data, headers=self.headers)
+        response = self.session.post(url, data=data)
         response.raise_for_status()
         data = response.json()
         return data["clone_url"]
@@ -108,7 +153,7 @@ class GitHubClient:
         payload = {"default_branch": branch_name}
 
         try:
-            response = requests.patch(url, json=payload, headers=self.headers)
+            response = self.session.patch(url, json=payload)
             response.raise_for_status()
             logger.info(f"Rama por defecto cambiada a '{branch_name}' en GitHub.")
             return True
@@ -124,7 +169,78 @@ class GitHubClient:
         Github no garantiza un orden específico, pero suele devolverlas de la más reciente a la más antigua.
         """
         url = f"{self.base_url}/repos/{owner}/{repo_name}/tags"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url)
         if response.status_code == 200:
             return [tag["name"] for tag in response.json()]
         return []
+
+    def fetch_repo_and_tags(
+        self, owner: str, repo_name: str
+    ) -> tuple[Optional[str], list[str]]:
+        """
+        Consulta el repositorio y, si existe, sus etiquetas (respaldo REST de preflight).
+        Devuelve (url_remota, etiquetas); si el repositorio no existe, (None, []).
+        Las peticiones van una tras otra: requests.Session no es segura entre hilos.
+        """
+        repo_url = f"{self.base_url}/repos/{owner}/{repo_name}"
+        repo_response = self.session.get(repo_url)
+        if repo_response.status_code == 404:
+            return None, []
+        repo_response.raise_for_status()
+
+        tags = []
+        tags_response = self.session.get(f"{repo_url}/tags", params={"per_page": 100})
+        if tags_response.status_code == 200:
+            tags = [tag["name"] for tag in tags_response.json()]
+
+        return f"https://github.com/{owner}/{repo_name}.git", tags
+
+    def preflight(self, repo_name: str) -> tuple[str, Optional[str], list[str]]:
+        """
+        Obtiene en una sola consulta GraphQL el usuario del token, si el repositorio
+        existe y sus etiquetas: (usuario, url_remota o None, etiquetas).
+        Solo pagina si hay más de 100 tags. Si GraphQL falla, recurre a la API REST.
+        """
+        try:
+            username, exists, tags = self._graphql_preflight(repo_name)
+        except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Consulta GraphQL fallida ({e}). Usando la API REST.")
+            username = self.get_authenticated_user()
+            remote_url, tags = self.fetch_repo_and_tags(username, repo_name)
+            return username, remote_url, tags
+
+        remote_url = (
+            f"https://github.com/{username}/{repo_name}.git" if exists else None
+        )
+        return username, remote_url, tags
+
+    def _graphql_preflight(self, repo_name: str) -> tuple[str, bool, list[str]]:
+        url = f"{self.base_url}/graphql"
+        tags: list[str] = []
+        cursor = None
+
+        while True:
+            variables = {"name": repo_name, "cursor": cursor}
+            response = self.session.post(
+                url, json={"query": PREFLIGHT_QUERY, "variables": variables}
+            )
+            response.raise_for_status()
+            payload = response.json()
+
+            viewer = payload["data"]["viewer"]
+            repository = viewer["repository"]
+            if repository is None:
+                # Un repositorio inexistente llega como null + error NOT_FOUND;
+                # cualquier otro error (permisos, scopes) no permite concluir nada.
+                errors = payload.get("errors") or []
+                if any(error.get("type") != "NOT_FOUND" for error in errors):
+                    raise ValueError(errors[0].get("message"))
+                self._user = viewer["login"]
+                return viewer["login"], False, []
+
+            refs = repository["refs"]
+            tags.extend(node["name"] for node in refs["nodes"])
+            if not refs["pageInfo"]["hasNextPage"]:
+                self._user = viewer["login"]
+                return viewer["login"], True, tags
+            cursor = refs["pageInfo"]["endCursor"]
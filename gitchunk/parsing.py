@@ -1,5 +1,6 @@
 import re
 from collections import defaultdict
+from functools import lru_cache
 
 from packaging.version import Version
 from packaging.version import parse as parse_version
@@ -7,7 +8,8 @@ from packaging.version import parse as parse_version
 
 def strip_metadata(version_str: str) -> str:
     """Elimina metadatos de build (ej: +chunked) del string."""
-    return re.sub(r"\+chunked", "", version_str)
+    # Literal fijo: str.replace evita pasar por el motor de regex en cada tag.
+    return version_str.replace("+chunked", "")
 
 
 def strip_platform(version_str: str) -> str:
@@ -15,9 +17,11 @@ def strip_platform(version_str: str) -> str:
     return re.sub(r"-[a-zA-Z0-9_]+(?=\+|$)", "", version_str)
 
 
+@lru_cache(maxsize=512)
 def get_comparable_version(version_str: str) -> Version:
     """
     Convierte cualquier string (Ch.2, v1.0, 1.2.3) en un objeto Version comparable.
+    Memoizada: las mismas versiones se repiten entre juegos de un mismo lote.
     """
     # Remueve plataforma o prefijo chunked
     clean = strip_metadata(version_str)
@@ -41,3 +45,12 @@ def grouped_by_platform(versions: list[str]):
             version_str, platform = no_metadata.rsplit("-", 1)
             group[platform].append(version_str)
     return group
+
+
+def versions_for_platform(tags: list[str], platform: str) -> list[str]:
+    """
+    Devuelve la versión de cada tag de `platform` (ej: v1.0-pc+chunked -> v1.0),
+    en una sola pasada con una regex compilada, sin agrupar las demás plataformas.
+    """
+    pattern = re.compile(rf"^(?P<version>.+)-{re.escape(platform)}(?:\+chunked)?$")
+    return [match["version"] for tag in tags if (match := pattern.match(tag))]
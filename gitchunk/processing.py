@@ -1,9 +1,38 @@
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from .constants import MAX_BATCH_SIZE_BYTES, MAX_FILE_SIZE_BYTES, MAX_TOTAL_SIZE_ALLOWED
 from .schemas import Batchs, FilesFiltered, GitStatus
 
+# Por debajo de este número de archivos no compensa levantar hilos para el stat.
+PARALLEL_STAT_THRESHOLD = 64
+
+
+def get_file_size(path: str) -> Optional[int]:
+    """Tamaño en bytes del archivo, o None si ya no existe."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def get_file_sizes(root: str, files_rel: List[str]) -> List[Optional[int]]:
+    """
+    Obtiene el tamaño de cada archivo relativo a `root`.
+    Con muchos archivos el stat se reparte en hilos (os.stat libera el GIL),
+    lo que en discos de red o en frío solapa la latencia de cada llamada.
+    """
+    paths = [os.path.join(root, f) for f in files_rel]
+    if len(paths) < PARALLEL_STAT_THRESHOLD:
+        return [get_file_size(p) for p in paths]
+
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(get_file_size, paths, chunksize=64))
+
 
 def filter_files_from_status(repo_path: Path, git_status: GitStatus) -> FilesFiltered:
     """
@@ -21,15 +50,12 @@ def filter_files_from_status(repo_path: Path, git_status: GitStatus) -> FilesFil
     files_to_chunk = []
     invalid_files = []
 
-    for file_rel in pending_content:
-        full_path = repo_path / file_rel
-
-        # Doble comprobación: si el archivo desapareció justo ahora, saltar
-        if not full_path.exists():
+    sizes = get_file_sizes(os.fspath(repo_path), pending_content)
+    for file_rel, size in zip(pending_content, sizes):
+        # Si el archivo desapareció justo ahora, saltar
+        if size is None:
             continue
 
-        size = full_path.stat().st_size
-
         if size <= MAX_FILE_SIZE_BYTES:
             files_to_batch.append((file_rel, size))
         elif size <= MAX_TOTAL_SIZE_ALLOWED:
@@ -89,11 +115,16 @@ def apply_file_transformations(
         full_path = game_path / file_rel
 
         created_chunks = FileChunker.split_file(full_path, chunk_limit)
+        # El tamaño de cada trozo se deduce del tamaño original: sin stat por trozo.
+        chunk_sizes = FileChunker.part_sizes(size, chunk_limit)
 
         final_files.deleted_files.append(str(file_rel))
-        for chunk_path in created_chunks:
-            rel_chunk = chunk_path.relative_to(game_path).as_posix()
-            final_files.files_to_batch.append((rel_chunk, chunk_path.stat().st_size))
+        # Los trozos quedan junto al original: su ruta relativa sale de file_rel
+        # sin resolver cada Path contra game_path.
+        rel_dir = posixpath.dirname(file_rel)
+        for chunk_path, chunk_size in zip(created_chunks, chunk_sizes):
+            rel_chunk = posixpath.join(rel_dir, chunk_path.name)
+            final_files.files_to_batch.append((rel_chunk, chunk_size))
 
         has_transformed = True
 
@@ -2,7 +2,7 @@ import hashlib
 import logging
 import re
 from pathlib import Path
-from time import sleep
+from time import monotonic, sleep
 
 from .schemas import *
 
@@ -27,13 +27,13 @@ def sleep_progress(seconds: float):
         f"Esperando {total // 60} minutos y {total % 60} segundos antes de continuar..."
     )
 
-    for i in range(total, 0, -1):
-        sleep(1)
-        if i % 60 == 0:
-            mins_left = i // 60
+    # Un despertar por minuto (alineado al minuto restante) en lugar de uno por segundo.
+    end = monotonic() + total
+    while (remaining := end - monotonic()) > 0:
+        sleep(min(remaining % 60 or 60, remaining))
+        mins_left = round((end - monotonic()) / 60)
+        if mins_left > 0:
             logger.info(f"Faltan {mins_left} minutos...")
-        elif i <= 10:  # Mostrar segundos finales
-            logger.info(f"{i} segundos restantes...")
 
 
 def create_md5sum_by_hashlib(path: Path):
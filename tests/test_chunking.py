@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from gitchunk.chunking import FileChunker
+
+
+class TestFileChunker(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _roundtrip(self, size: int, chunk_size: int) -> list[Path]:
+        original = self.folder / "sub" / "video.mp4"
+        original.parent.mkdir(exist_ok=True)
+        data = os.urandom(size)
+        original.write_bytes(data)
+
+        chunks = FileChunker.split_file(original, chunk_size)
+
+        self.assertFalse(original.exists())
+        self.assertEqual(sum(c.stat().st_size for c in chunks), size)
+
+        FileChunker.join_files(self.folder)
+
+        self.assertEqual(original.read_bytes(), data)
+        self.assertEqual([p.name for p in original.parent.iterdir()], ["video.mp4"])
+        return chunks
+
+    def test_split_and_join_restores_original(self):
+        chunks = self._roundtrip(size=1000, chunk_size=300)
+        self.assertEqual(
+            [c.name for c in chunks],
+            [f"video.mp4.gc.{n:03d}" for n in range(1, 5)],
+        )
+
+    def test_exact_multiple_of_chunk_size(self):
+        chunks = self._roundtrip(size=900, chunk_size=300)
+        self.assertEqual(len(chunks), 3)
+
+    def test_single_part_split_renames_original(self):
+        chunks = self._roundtrip(size=100, chunk_size=300)
+        self.assertEqual([c.name for c in chunks], ["video.mp4.gc.001"])
+
+    def test_parts_are_ordered_numerically_past_999(self):
+        chunks = self._roundtrip(size=1001, chunk_size=1)
+        self.assertEqual(chunks[-1].name, "video.mp4.gc.1001")
+
+    def test_part_sizes_match_written_chunks(self):
+        original = self.folder / "video.mp4"
+        original.write_bytes(os.urandom(1000))
+
+        chunks = FileChunker.split_file(original, 300)
+
+        self.assertEqual(
+            [c.stat().st_size for c in chunks], FileChunker.part_sizes(1000, 300)
+        )
+
+    def test_join_skips_incomplete_groups(self):
+        original = self.folder / "video.mp4"
+        original.write_bytes(os.urandom(1000))
+        chunks = FileChunker.split_file(original, 300)
+        chunks[1].unlink()
+
+        FileChunker.join_files(self.folder)
+
+        self.assertFalse(original.exists())
+        self.assertTrue(chunks[0].exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
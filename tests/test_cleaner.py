@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from gitchunk.game.cleaner import GameCleaner
+
+
+class TestGameCleaner(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _create(self, *files: str):
+        for file in files:
+            path = self.root / file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x")
+
+    def _listing(self) -> list[str]:
+        return sorted(p.relative_to(self.root).as_posix() for p in self.root.rglob("*"))
+
+    def test_clean_applies_all_rules_in_one_pass(self):
+        self._create(
+            "game/script.rpy",
+            "game/script.rpyc",
+            "game/orphan.rpyc",
+            "game/lib.rpym",
+            "game/lib.rpymc",
+            "game/cache/nested/deep.bin",
+            "game/saves/1.save",
+            "lib/__pycache__/mod.pyc",
+            "traceback.txt",
+            "game/errors.txt",
+            "run.log",
+            "mod.pyo",
+            "keep/data.txt",
+        )
+
+        GameCleaner(self.root).clean()
+
+        self.assertEqual(
+            self._listing(),
+            [
+                "game",
+                "game/lib.rpym",
+                "game/orphan.rpyc",
+                "game/script.rpy",
+                "keep",
+                "keep/data.txt",
+                "lib",
+            ],
+        )
+
+    def test_git_folder_is_never_touched(self):
+        self._create(".git/logs/HEAD", ".git/tmp/pack.log", ".git/x.rpyc", ".git/x.rpy")
+
+        GameCleaner(self.root).clean()
+
+        self.assertTrue((self.root / ".git/tmp/pack.log").exists())
+        self.assertTrue((self.root / ".git/x.rpyc").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,10 +27,12 @@ class TestArchivingFlowRules(unittest.TestCase):
         """
         scanner_instance = MockScanner.return_value
         repo_instance = MockRepo.return_value
-        repo_instance.analyze_changes.return_value = (
+        repo_instance.analyze_files.return_value = (
             {"invalid_files": []},
             {"to_add": [], "to_delete": []},
         )
+        # El repositorio aún no existe en GitHub
+        MockGitHub.return_value.preflight.return_value = ("user", None, [])
 
         # Detectamos Windows
         scanner_instance.scan.return_value = GameMetadata(
@@ -83,10 +85,12 @@ class TestArchivingFlowRules(unittest.TestCase):
         gh_instance = MockGitHub.return_value
         scanner_instance = MockScanner.return_value
 
-        # Escenario: El remoto ya existe
-        gh_instance.repo_exists.return_value = True
-        # El remoto tiene la versión 2.0 para PC
-        gh_instance.get_remote_tags.return_value = ["v2.0.0-pc"]
+        # Escenario: El remoto ya existe y tiene la versión 2.0 para PC
+        gh_instance.preflight.return_value = (
+            "user",
+            "https://github.com/user/gitchunk-game-my_game.git",
+            ["v2.0.0-pc"],
+        )
 
         # Escenario Local: Tenemos una versión VIEJA (1.0)
         scanner_instance.scan.return_value = GameMetadata(
@@ -120,15 +124,17 @@ class TestArchivingFlowRules(unittest.TestCase):
         scanner_instance = MockScanner.return_value
         repo_instance = MockRepo.return_value
 
-        repo_instance.analyze_changes.return_value = (
+        repo_instance.analyze_files.return_value = (
             {"invalid_files": []},
             {"to_add": [], "to_delete": []},
         )
 
-        gh_instance.repo_exists.return_value = True
-
-        # El remoto tiene v2.0 pero es de LINUX
-        gh_instance.get_remote_tags.return_value = ["v2.0.0-linux"]
+        # El remoto existe y tiene v2.0 pero es de LINUX
+        gh_instance.preflight.return_value = (
+            "user",
+            "https://github.com/user/gitchunk-game-my_game.git",
+            ["v2.0.0-linux"],
+        )
 
         # Localmente tenemos v1.0 pero es de WINDOWS
         scanner_instance.scan.return_value = GameMetadata(
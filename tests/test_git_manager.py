@@ -0,0 +1,245 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from git import Actor, Repo
+
+from gitchunk.git_manager import (
+    commit_index,
+    get_explicit_user_email,
+    get_sync_status,
+    remove_files_from_index,
+    set_local_user_email,
+)
+from gitchunk.schemas import SyncStatus
+
+
+class TestCommitIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+        self.repo = Repo.init(self.folder)
+        self.author = Actor("Gitchunk", "gitchunk@example.com")
+
+    def tearDown(self):
+        self.repo.close()
+        self._tmp.cleanup()
+
+    def _stage(self, files: dict[str, str]):
+        for name, content in files.items():
+            path = self.folder / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        self.repo.git.add("-A")
+
+    def test_first_commit_has_no_parent(self):
+        self._stage({"a": "a"})
+
+        commit = commit_index(self.repo, "primero", self.author)
+
+        self.assertEqual(commit.parents, ())
+        self.assertEqual(commit.summary, "primero")
+        self.assertEqual(self.repo.head.commit, commit)
+        self.assertEqual(self.repo.head.log()[-1].message, "commit (initial): primero")
+
+    def test_author_and_committer_identity(self):
+        self._stage({"a": "a"})
+
+        commit = commit_index(self.repo, "primero", self.author)
+
+        for actor in (commit.author, commit.committer):
+            self.assertEqual(actor.name, "Gitchunk")
+            self.assertEqual(actor.email, "gitchunk@example.com")
+
+    def test_tree_matches_index(self):
+        self._stage({"a": "a", "sub/b": "b"})
+
+        commit = commit_index(self.repo, "primero", self.author)
+
+        self.assertEqual(
+            sorted(item.path for item in commit.tree.traverse()),
+            ["a", "sub", "sub/b"],
+        )
+        self.assertEqual(commit.tree["sub/b"].data_stream.read(), b"b")
+
+    def test_updates_branch_to_new_commit(self):
+        self._stage({"a": "a"})
+        first = commit_index(self.repo, "primero", self.author)
+        self._stage({"a": "A", "c": "c"})
+
+        second = commit_index(self.repo, "segundo", self.author)
+
+        self.assertEqual(second.parents, (first,))
+        self.assertEqual(self.repo.active_branch.commit, second)
+        self.assertEqual(self.repo.head.log()[-1].message, "commit: segundo")
+        self.assertEqual(
+            sorted(item.path for item in second.tree.traverse()), ["a", "c"]
+        )
+
+
+class TestRemoveFilesFromIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+        self.repo = Repo.init(self.folder)
+        for name in ("a", "b", "c"):
+            (self.folder / name).write_text(name)
+        self.repo.git.add("-A")
+        commit_index(self.repo, "inicial", Actor("Gitchunk", "gitchunk@example.com"))
+
+    def tearDown(self):
+        self.repo.close()
+        self._tmp.cleanup()
+
+    def _indexed(self) -> list[str]:
+        return self.repo.git.ls_files().splitlines()
+
+    def test_removes_batch(self):
+        remove_files_from_index(self.repo, ["a", "c"])
+
+        self.assertEqual(self._indexed(), ["b"])
+        self.assertFalse((self.folder / "a").exists())
+
+    def test_ignores_paths_not_in_index(self):
+        (self.folder / "untracked").write_text("x")
+
+        with self.assertNoLogs("gitchunk.git_manager", level="WARNING"):
+            remove_files_from_index(self.repo, ["a", "untracked", "c"])
+
+        self.assertEqual(self._indexed(), ["b"])
+        self.assertFalse((self.folder / "a").exists())
+        self.assertTrue((self.folder / "untracked").exists())
+
+
+class TestGetSyncStatus(unittest.TestCase):
+    BRANCH = "main"
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+        self.author = Actor("Gitchunk", "gitchunk@example.com")
+
+        self.bare_path = self.folder / "remote.git"
+        self.bare = Repo.init(self.bare_path, bare=True)
+        self.local = self._new_repo(Repo.init(self.folder / "local"))
+        self.remote = self.local.create_remote("origin", str(self.bare_path))
+
+    def tearDown(self):
+        for repo in (self.local, self.bare):
+            repo.close()
+        self._tmp.cleanup()
+
+    def _new_repo(self, repo: Repo) -> Repo:
+        repo.git.symbolic_ref("HEAD", f"refs/heads/{self.BRANCH}")
+        return repo
+
+    def _commit(self, repo: Repo, name: str) -> str:
+        (Path(repo.working_tree_dir) / name).write_text(name)
+        repo.git.add("-A")
+        return commit_index(repo, name, self.author).hexsha
+
+    def _push(self, repo: Repo):
+        repo.git.push("origin", f"HEAD:refs/heads/{self.BRANCH}")
+
+    def _push_from_other_clone(self, name: str) -> str:
+        """Simula que otra máquina subió un commit nuevo a la rama."""
+        other = Repo.clone_from(
+            self.bare_path, self.folder / "other", branch=self.BRANCH
+        )
+        try:
+            sha = self._commit(other, name)
+            self._push(other)
+        finally:
+            other.close()
+        return sha
+
+    def _status(self):
+        return get_sync_status(self.local, self.remote, self.BRANCH)
+
+    def test_empty_remote(self):
+        self._commit(self.local, "a")
+
+        self.assertEqual(self._status(), (SyncStatus.NO_REMOTE, None))
+
+    def test_equal(self):
+        sha = self._commit(self.local, "a")
+        self._push(self.local)
+
+        self.assertEqual(self._status(), (SyncStatus.EQUAL, sha))
+
+    def test_ahead(self):
+        pushed = self._commit(self.local, "a")
+        self._push(self.local)
+        self._commit(self.local, "b")
+
+        self.assertEqual(self._status(), (SyncStatus.AHEAD, pushed))
+
+    def test_behind(self):
+        self._commit(self.local, "a")
+        self._push(self.local)
+        remote_sha = self._push_from_other_clone("b")
+
+        self.assertEqual(self._status(), (SyncStatus.BEHIND, remote_sha))
+        # El commit remoto se trajo con el fetch.
+        self.assertEqual(self.local.commit(remote_sha).hexsha, remote_sha)
+
+    def test_behind_with_empty_local(self):
+        other = self._new_repo(Repo.init(self.folder / "other"))
+        other.create_remote("origin", str(self.bare_path))
+        remote_sha = self._commit(other, "a")
+        self._push(other)
+        other.close()
+
+        self.assertEqual(self._status(), (SyncStatus.BEHIND, remote_sha))
+
+    def test_diverged(self):
+        self._commit(self.local, "a")
+        self._push(self.local)
+        remote_sha = self._push_from_other_clone("b")
+        self._commit(self.local, "c")
+
+        self.assertEqual(self._status(), (SyncStatus.DIVERGED, remote_sha))
+
+
+class TestUserIdentityLevels(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.home = Path(self._tmp.name)
+        env = {
+            "HOME": str(self.home),
+            "XDG_CONFIG_HOME": str(self.home / ".config"),
+            "GIT_CONFIG_NOSYSTEM": "1",
+        }
+        self._env = patch.dict(os.environ, env)
+        self._env.start()
+        os.environ.pop("GIT_CONFIG_GLOBAL", None)
+        self.repo = Repo.init(self.home / "repo")
+
+    def tearDown(self):
+        self.repo.close()
+        self._env.stop()
+        self._tmp.cleanup()
+
+    def test_global_level_writes_gitconfig_even_if_only_xdg_exists(self):
+        set_local_user_email(self.repo, "Xdg", "xdg@example.com", level="user")
+        self.assertFalse((self.home / ".gitconfig").exists())
+
+        set_local_user_email(self.repo, "Global", "global@example.com", "global")
+
+        self.assertTrue((self.home / ".gitconfig").exists())
+        self.assertEqual(
+            get_explicit_user_email(self.repo),
+            {
+                "user": {"user.name": "Xdg", "user.email": "xdg@example.com"},
+                "global": {"user.name": "Global", "user.email": "global@example.com"},
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()